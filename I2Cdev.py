@@ -1,20 +1,234 @@
+import bisect
+import contextlib
 import time
 import smbus2
 
+
+class TracedBus:
+    """SMBus wrapper that reports every transaction to a list of hooks.
+
+    Each hook is called as hook(op, i2c_addr, register, length, seconds, data)
+    with op 'read' or 'write', the first register of the transfer, the number
+    of data bytes moved, the time spent in the bus call and the value or values
+    transferred. I2Cdev only puts this wrapper in front of the bus while a hook
+    is installed, so untraced access goes straight to the bus.
+    """
+
+    def __init__(self, smbus, hooks):
+        self.smbus = smbus
+        self.hooks = hooks
+
+    def _report(self, op, i2c_addr, register, length, start, data):
+        seconds = time.perf_counter() - start
+        for hook in self.hooks:
+            hook(op, i2c_addr, register, length, seconds, data)
+
+    def read_byte_data(self, i2c_addr, register, force=None):
+        start = time.perf_counter()
+        value = self.smbus.read_byte_data(i2c_addr, register, force)
+        self._report('read', i2c_addr, register, 1, start, value)
+        return value
+
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        start = time.perf_counter()
+        result = self.smbus.write_byte_data(i2c_addr, register, value, force)
+        self._report('write', i2c_addr, register, 1, start, value)
+        return result
+
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        start = time.perf_counter()
+        values = self.smbus.read_i2c_block_data(i2c_addr, register, length, force)
+        self._report('read', i2c_addr, register, length, start, values)
+        return values
+
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        start = time.perf_counter()
+        result = self.smbus.write_i2c_block_data(i2c_addr, register, data, force)
+        self._report('write', i2c_addr, register, len(data), start, data)
+        return result
+
+    def read_word_data(self, i2c_addr, register, force=None):
+        start = time.perf_counter()
+        value = self.smbus.read_word_data(i2c_addr, register, force)
+        self._report('read', i2c_addr, register, 2, start, value)
+        return value
+
+    def write_word_data(self, i2c_addr, register, value, force=None):
+        start = time.perf_counter()
+        result = self.smbus.write_word_data(i2c_addr, register, value, force)
+        self._report('write', i2c_addr, register, 2, start, value)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.smbus, name)
+
+
+def print_trace(op, i2c_addr, register, length, seconds, data):
+    """Hook printing every transaction, installed by I2Cdev.debug = True."""
+    if isinstance(data, int):
+        data = f"{data:#04x}"
+    else:
+        data = bytes(data).hex(' ')
+    print(f"I2C {i2c_addr:#04x} {op:5} {register:#04x} [{length}] {data} ({seconds * 1e6:.0f} us)")
+
+
+class BusProfile:
+    """Hook collecting per-register bus statistics.
+
+    For every (op, register) pair it keeps the number of transfers, bytes moved,
+    total time and a latency histogram over HISTOGRAM_BOUNDS. Use it through
+    I2Cdev.profile() or install it with add_hook().
+    """
+    HISTOGRAM_BOUNDS = (50e-6, 100e-6, 200e-6, 500e-6, 1e-3, 2e-3, 5e-3, 10e-3) # upper bucket edges, seconds
+
+    def __init__(self, names=None):
+        self.names = names or {} # register -> name, for summary()
+        self.stats = {} # (op, register) -> [count, bytes, seconds, histogram]
+
+    def __call__(self, op, i2c_addr, register, length, seconds, data):
+        entry = self.stats.get((op, register))
+        if entry is None:
+            entry = self.stats[(op, register)] = [0, 0, 0.0, [0] * (len(self.HISTOGRAM_BOUNDS) + 1)]
+        entry[0] += 1
+        entry[1] += length
+        entry[2] += seconds
+        entry[3][bisect.bisect_left(self.HISTOGRAM_BOUNDS, seconds)] += 1
+
+    def clear(self):
+        self.stats.clear()
+
+    def totals(self):
+        """(transfers, bytes, seconds) over all registers."""
+        return (sum(entry[0] for entry in self.stats.values()),
+                sum(entry[1] for entry in self.stats.values()),
+                sum(entry[2] for entry in self.stats.values()))
+
+    def report(self):
+        """Statistics as a list of dicts, the registers taking the most bus time first."""
+        rows = []
+        for (op, register), (count, nbytes, seconds, histogram) in self.stats.items():
+            rows.append({'op': op, 'register': register, 'name': self.names.get(register),
+                         'count': count, 'bytes': nbytes, 'seconds': seconds, 'histogram': list(histogram)})
+        rows.sort(key=lambda row: row['seconds'], reverse=True)
+        return rows
+
+    def summary(self, top=10):
+        """Printable table of the registers that dominate bus time."""
+        count, nbytes, seconds = self.totals()
+        lines = [f"{count} transfers, {nbytes} bytes, {seconds * 1000:.1f} ms on the bus",
+                 f"{'op':5} {'register':24} {'count':>7} {'bytes':>8} {'ms':>8} {'share':>6} {'mean us':>8}"]
+        for row in self.report()[:top]:
+            name = f"{row['register']:#04x} {row['name'] or ''}"
+            share = row['seconds'] / seconds * 100 if seconds else 0.0
+            lines.append(f"{row['op']:5} {name:24} {row['count']:7} {row['bytes']:8} {row['seconds'] * 1000:8.2f} "
+                         f"{share:5.1f}% {row['seconds'] / row['count'] * 1e6:8.0f}")
+        return '\n'.join(lines)
+
+
 class I2Cdev:
-    def __init__(self, bus=None, i2c_addr=0, debug=False):
-        self.smbus = smbus2.SMBus(bus=bus)
+    MAX_BLOCK_SIZE = 32 # largest SMBus block transfer
+
+    def __init__(self, bus=None, i2c_addr=0, debug=False, cache=False, volatile_registers=(), self_clearing_bits=None, smbus=None):
+        # An already open (possibly shared) bus handle can be passed in instead of opening bus
+        self.bus = smbus if smbus is not None else smbus2.SMBus(bus=bus)
+        self.smbus = self.bus # the bus itself, or a TracedBus in front of it while hooks are installed
         self.i2c_addr = i2c_addr
+        self._hooks = []
         self.debug = debug
 
-    def _debug_print(self, message):
-        if self.debug:
-            print(message)
+        # Register shadow: last known value of every non-volatile register.
+        # Volatile registers (status, counters, sensor outputs, data ports) are
+        # always read from the bus. Self-clearing bits are dropped from the
+        # shadowed value after a write since the device clears them itself.
+        self.cache = cache
+        self.volatile_registers = frozenset(volatile_registers)
+        self.self_clearing_bits = dict(self_clearing_bits or {})
+        self._shadow = {}
+
+    def add_hook(self, hook):
+        """Report every bus transaction to hook, see TracedBus."""
+        self._hooks.append(hook)
+        self.smbus = TracedBus(self.bus, self._hooks)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+        if not self._hooks:
+            self.smbus = self.bus
+
+    @property
+    def debug(self):
+        return print_trace in self._hooks
+
+    @debug.setter
+    def debug(self, enabled):
+        if enabled and not self.debug:
+            self.add_hook(print_trace)
+        elif not enabled and self.debug:
+            self.remove_hook(print_trace)
+
+    @contextlib.contextmanager
+    def profile(self, names=None):
+        """Collect a BusProfile over the enclosed block.
+
+            with device.wireObj.profile() as profile:
+                device.dmpInitialize()
+            print(profile.summary())
+        """
+        profile = BusProfile(names)
+        self.add_hook(profile)
+        try:
+            yield profile
+        finally:
+            self.remove_hook(profile)
+
+    def invalidate_cache(self, register=None, length=1):
+        """Forget shadowed register values, all of them if no register is given."""
+        if register is None:
+            self._shadow.clear()
+            return
+        for i in range(length):
+            self._shadow.pop(register + i, None)
+
+    def _is_cacheable(self, register):
+        return self.cache and register not in self.volatile_registers
+
+    def _store(self, register, value):
+        if self._is_cacheable(register):
+            self._shadow[register] = value & ~self.self_clearing_bits.get(register, 0) & 0xFF
+
+    def _store_block(self, register, values):
+        # Block transfers to a volatile register (FIFO_R_W, MEM_R_W) stream
+        # through a single port instead of auto-incrementing the address
+        if not self._is_cacheable(register):
+            return
+        for i, value in enumerate(values):
+            self._store(register + i, value)
+
+    def _read_register(self, register):
+        """Read a byte, serving it from the shadow when possible."""
+        if self._is_cacheable(register):
+            value = self._shadow.get(register)
+            if value is None:
+                value = self.smbus.read_byte_data(self.i2c_addr, register)
+                self._shadow[register] = value
+            return value
+        return self.smbus.read_byte_data(self.i2c_addr, register)
+
+    def _read_block(self, register, length):
+        """Read a block, serving it from the shadow when every byte is known."""
+        if self._is_cacheable(register):
+            shadow = self._shadow
+            values = [shadow.get(register + i) for i in range(length)]
+            if None not in values and not any((register + i) in self.volatile_registers for i in range(length)):
+                return values
+            values = self.smbus.read_i2c_block_data(self.i2c_addr, register, length)
+            self._store_block(register, values)
+            return values
+        return self.smbus.read_i2c_block_data(self.i2c_addr, register, length)
 
     def write_bit(self, register, bit_position, value):
         """Write a single bit to a specified register."""
-        current_value = self.smbus.read_byte_data(self.i2c_addr, register)
-        self._debug_print(f"Current Value (before writing bit): {current_value:#04x}")
+        current_value = self._read_register(register)
 
         mask = 1 << bit_position
         if value:
@@ -23,22 +237,19 @@ class I2Cdev:
             new_value = current_value & ~mask
 
         self.smbus.write_byte_data(self.i2c_addr, register, new_value)
-        self._debug_print(f"Wrote Bit: {value}, Register: {register:#04x}, New Value: {new_value:#04x}")
+        self._store(register, new_value)
 
     def read_bit(self, register, bit_position):
         """Read a single bit from a specified register."""
-        current_value = self.smbus.read_byte_data(self.i2c_addr, register)
-        self._debug_print(f"Read Value: {current_value:#04x} from Register: {register:#04x}")
+        current_value = self._read_register(register)
 
         mask = 1 << bit_position
         bit_value = (current_value & mask) >> bit_position
-        self._debug_print(f"Bit Value at Position {bit_position}: {bit_value}")
         return bit_value
 
     def write_bits(self, register, bit_start, length, value):
         """Write bits to a specified register."""
-        current_value = self.smbus.read_byte_data(self.i2c_addr, register)
-        self._debug_print(f"Current Value (before writing bits): {current_value:#04x}")
+        current_value = self._read_register(register)
 
         mask = ((1 << length) - 1) << (bit_start - length + 1)
 
@@ -48,7 +259,7 @@ class I2Cdev:
         # Zero out all non-important bits in data
         value &= mask
 
-        new_value = value
+        new_value = current_value
 
         # Zero out all important bits in existing byte
         new_value &= ~mask
@@ -57,50 +268,45 @@ class I2Cdev:
         new_value |= value
 
         self.smbus.write_byte_data(self.i2c_addr, register, new_value)
-        self._debug_print(f"Wrote Bits: {value}, Register: {register:#04x}, New Value: {new_value:#04x}")
+        self._store(register, new_value)
 
     def read_bits(self, register, bit_start, length):
         """Read bits from a specified register."""
-        current_value = self.smbus.read_byte_data(self.i2c_addr, register)
-        self._debug_print(f"Read Value: {current_value:#04x} from Register: {register:#04x}")
+        current_value = self._read_register(register)
 
         mask = ((1 << length) - 1) << (bit_start - length + 1)
     
         # Apply the mask and shift the bits to the right
         extracted_bits = (current_value & mask) >> (bit_start - length + 1)
 
-        self._debug_print(f"Bits Value from Position {bit_start} Length {length}: {extracted_bits}")
         return extracted_bits
 
     def write_bytes(self, register, values):
         self.smbus.write_i2c_block_data(self.i2c_addr, register, values)
-        self._debug_print(f"Wrote {len(values)} Bytes: {values} to Register: {register:#04x}")
+        self._store_block(register, values)
 
     def write_bytes_s(self, register, values):
         for i, byte_value in enumerate(values):
             self.smbus.write_byte_data(self.i2c_addr, register + i, byte_value)
-        self._debug_print(f"Wrote {len(values)} Bytes: {values} to Register: {register:#04x}")
+            self._store(register + i, byte_value)
 
     def read_bytes(self, register, length):
-        values = self.smbus.read_i2c_block_data(self.i2c_addr, register, length)
-        self._debug_print(f"Read {length} Bytes from Register: {register:#04x}, Values: {bytearray(values)}")
+        values = self._read_block(register, length)
         return bytearray(values)
     
     def read_bytes_s(self, register, length):
         values = []
         for i in range(length):
-            byte_value = self.smbus.read_byte_data(self.i2c_addr, register + i)
+            byte_value = self._read_register(register + i)
             values.append(byte_value)
-        self._debug_print(f"Read {len(values)} Bytes from Register: {register:#04x}, Values: {bytearray(values)}")
         return bytearray(values)
 
     def write_byte(self, register, value):
         self.smbus.write_byte_data(self.i2c_addr, register, value)
-        self._debug_print(f"Wrote Byte: {value} to Register: {register:#04x}")
+        self._store(register, value)
 
     def read_byte(self, register):
-        value = self.smbus.read_byte_data(self.i2c_addr, register)
-        self._debug_print(f"Read Byte from Register: {register:#04x}, Value: {value}")
+        value = self._read_register(register)
         return value
 
     def write_word(self, register, value):
@@ -112,11 +318,10 @@ class I2Cdev:
         lsb = value & 0xFF         # Least significant byte
 
         self.smbus.write_i2c_block_data(self.i2c_addr, register, bytes([msb, lsb]))
-    
-        self._debug_print(f"Wrote Word: {value} to Register: {register:#04x}")
+        self._store_block(register, (msb, lsb))
 
     def read_word(self, register):
-        word_bytes = self.smbus.read_i2c_block_data(self.i2c_addr, register, 2)
+        word_bytes = self._read_block(register, 2)
         if len(word_bytes) < 2:
             print("Failed to read words.")
             return []
@@ -124,23 +329,15 @@ class I2Cdev:
             # Combine the two bytes into one word (16 bits)
         word = (word_bytes[0] << 8) | word_bytes[1]
         
-        self._debug_print(f"Read Word from Register: {register:#04x}, Value: {word}")
         return word
 
     def read_word_s(self, register):
         # Read two bytes from the specified register
         value = self.smbus.read_word_data(self.i2c_addr, register)
 
-        # Debug print for the raw value read
-        self._debug_print(f"Read Word from Register: {register:#04x}, Raw Value: {value}")
-
         # Convert the value to a signed integer
         # The value returned by read_word_data is unsigned, so we convert it.
         signed_value = value if value < 0x8000 else value - 0x10000
-
-        # Debug print for the signed value
-        self._debug_print(f"Converted to Signed Value: {signed_value}")
-
         return signed_value
     
     def write_words(self, register, values):
@@ -155,6 +352,7 @@ class I2Cdev:
             lsb = value & 0xFF         # Least significant byte
 
             self.smbus.write_i2c_block_data(self.i2c_addr, register + i*2, bytes([msb, lsb]))
+            self._store_block(register + i*2, (msb, lsb))
             i+= 1
             
 
@@ -163,7 +361,7 @@ class I2Cdev:
         for i in range(count):
 
             # Read two bytes (one word) from the device
-            word_bytes = self.smbus.read_i2c_block_data(self.i2c_addr, register + i*2, 2)
+            word_bytes = self._read_block(register + i*2, 2)
             if len(word_bytes) < 2:
                 print("Failed to read words.")
                 return []
@@ -346,10 +346,47 @@ class MPU6050_Base:
     MPU6050_DMP_MEMORY_BANK_SIZE =   256
     MPU6050_DMP_MEMORY_CHUNK_SIZE =  16
     MPU6050_FIFO_DEFAULT_TIMEOUT = 11000
-
-    def __init__(self, addr = MPU6050_DEFAULT_ADDRESS):
-        self.wireObj = I2Cdev(bus = 0, i2c_addr = addr, debug = False)
+    MPU6050_FIFO_SIZE = 1024
+    MPU6050_INT_POLL_INTERVAL = 0.002 # seconds between INT_STATUS polls when no interrupt source is set
+    MPU6050_TEMP_SCALE = 1 / 340.0
+    MPU6050_TEMP_OFFSET = 36.53
+
+    # The 14-byte burst from ACCEL_XOUT_H: accel x, y, z, temperature, gyro x, y, z
+    MOTION7 = struct.Struct('>7h')
+    WORDS3 = struct.Struct('>3h')
+    WORD = struct.Struct('>h')
+
+    # Registers whose contents change without a host write; never served from the register cache
+    MPU6050_VOLATILE_REGISTERS = frozenset(
+        [MPU6050_RA_I2C_SLV4_DI, MPU6050_RA_I2C_MST_STATUS, MPU6050_RA_DMP_INT_STATUS, MPU6050_RA_INT_STATUS]
+        + list(range(MPU6050_RA_ACCEL_XOUT_H, MPU6050_RA_MOT_DETECT_STATUS + 1)) # sensor, ext sensor data, motion status
+        + [MPU6050_RA_BANK_SEL, MPU6050_RA_MEM_START_ADDR, MPU6050_RA_MEM_R_W] # memory pointer auto-increments
+        + [MPU6050_RA_FIFO_COUNTH, MPU6050_RA_FIFO_COUNTL, MPU6050_RA_FIFO_R_W]
+    )
+
+    # Bits the device clears by itself once the requested action has been performed
+    MPU6050_SELF_CLEARING_BITS = {
+        MPU6050_RA_PWR_MGMT_1: 1 << MPU6050_PWR1_DEVICE_RESET_BIT,
+        MPU6050_RA_USER_CTRL: (1 << MPU6050_USERCTRL_DMP_RESET_BIT) | (1 << MPU6050_USERCTRL_FIFO_RESET_BIT)
+                            | (1 << MPU6050_USERCTRL_I2C_MST_RESET_BIT) | (1 << MPU6050_USERCTRL_SIG_COND_RESET_BIT),
+        MPU6050_RA_SIGNAL_PATH_RESET: (1 << MPU6050_PATHRESET_GYRO_RESET_BIT) | (1 << MPU6050_PATHRESET_ACCEL_RESET_BIT)
+                                    | (1 << MPU6050_PATHRESET_TEMP_RESET_BIT),
+    }
+
+    def __init__(self, addr = MPU6050_DEFAULT_ADDRESS, cache = False, bus = 0, smbus = None):
+        self.bus = bus
+        self.addr = addr
+        self.wireObj = I2Cdev(bus = bus, i2c_addr = addr, debug = False, cache = cache,
+                              volatile_registers = self.MPU6050_VOLATILE_REGISTERS,
+                              self_clearing_bits = self.MPU6050_SELF_CLEARING_BITS, smbus = smbus)
         self.start_time = time.perf_counter()  # Record the start time
+        self.interrupt = None
+        self.fifoTimeout = 1000 # us GetCurrentFIFOPacket waits for a complete packet
+        self.fifoPollInterval = self.MPU6050_INT_POLL_INTERVAL # s between its FIFO count polls without an interrupt source
+        self.accelScale = None # g and deg/s per LSB, read from the range registers on first use
+        self.gyroScale = None
+        self.memoryWriteReport = {}
+        self.calibrationReport = {}
 
     def micros(self):
         # Calculate the elapsed time in microseconds
@@ -359,8 +396,24 @@ class MPU6050_Base:
     def delay(self, milliseconds):
         time.sleep(milliseconds / 1000.0)
 
+    def profileBus(self):
+        """wireObj.profile() with MPU6050 register names in its summary.
+
+            with mpu.profileBus() as profile:
+                mpu.dmpInitialize()
+            print(profile.summary())
+        """
+        names = {}
+        for name, value in vars(MPU6050_Base).items():
+            if name.startswith('MPU6050_RA_'):
+                names.setdefault(value, name[len('MPU6050_RA_'):])
+        return self.wireObj.profile(names)
+
     def reset(self):
         self.wireObj.write_bit(self.MPU6050_RA_PWR_MGMT_1, self.MPU6050_PWR1_DEVICE_RESET_BIT, True)
+        self.wireObj.invalidate_cache() # every register is back at its power-on value
+        self.accelScale = None
+        self.gyroScale = None
 
     def setSleepEnabled(self, enabled):
         self.wireObj.write_bit(self.MPU6050_RA_PWR_MGMT_1, self.MPU6050_PWR1_SLEEP_BIT, enabled)
@@ -404,28 +457,144 @@ class MPU6050_Base:
     def setRate(self, rate):
         self.wireObj.write_byte(self.MPU6050_RA_SMPLRT_DIV, rate)
 
+    def getRate(self):
+        return self.wireObj.read_byte(self.MPU6050_RA_SMPLRT_DIV)
+
+    def getSampleRate(self):
+        """Sensor sample rate in Hz: gyro output rate (8kHz with the DLPF off, 1kHz otherwise) / (1 + SMPLRT_DIV)."""
+        mode = self.getDLPFMode()
+        gyro_rate = 8000 if mode in (0, 7) else 1000
+        return gyro_rate / (1 + self.getRate())
+
     def setExternalFrameSync(self, sync):
         self.wireObj.write_bits(self.MPU6050_RA_CONFIG, self.MPU6050_CFG_EXT_SYNC_SET_BIT, self.MPU6050_CFG_EXT_SYNC_SET_LENGTH, sync)
     
     def setDLPFMode(self, mode):
         self.wireObj.write_bits(self.MPU6050_RA_CONFIG, self.MPU6050_CFG_DLPF_CFG_BIT, self.MPU6050_CFG_DLPF_CFG_LENGTH, mode)
+
+    def getDLPFMode(self):
+        return self.wireObj.read_bits(self.MPU6050_RA_CONFIG, self.MPU6050_CFG_DLPF_CFG_BIT, self.MPU6050_CFG_DLPF_CFG_LENGTH)
     
     def setFullScaleGyroRange(self, range):
         self.wireObj.write_bits(self.MPU6050_RA_GYRO_CONFIG, self.MPU6050_GCONFIG_FS_SEL_BIT, self.MPU6050_GCONFIG_FS_SEL_LENGTH, range)
+        self.gyroScale = None
     
     def getFullScaleGyroRange(self):
         return self.wireObj.read_bits(self.MPU6050_RA_GYRO_CONFIG, self.MPU6050_GCONFIG_FS_SEL_BIT, self.MPU6050_GCONFIG_FS_SEL_LENGTH)
 
     def setFullScaleAccelRange(self, range):
         self.wireObj.write_bits(self.MPU6050_RA_ACCEL_CONFIG, self.MPU6050_ACONFIG_AFS_SEL_BIT, self.MPU6050_ACONFIG_AFS_SEL_LENGTH, range)
+        self.accelScale = None
     
     def getFullScaleAccelRange(self):
         return self.wireObj.read_bits(self.MPU6050_RA_ACCEL_CONFIG, self.MPU6050_ACONFIG_AFS_SEL_BIT, self.MPU6050_ACONFIG_AFS_SEL_LENGTH)
+
+    def getAccelScale(self):
+        """g per LSB for the current accel range; cached until setFullScaleAccelRange or reset."""
+        if self.accelScale is None:
+            self.accelScale = 1.0 / (16384 >> self.getFullScaleAccelRange())
+        return self.accelScale
+
+    def getGyroScale(self):
+        """deg/s per LSB for the current gyro range; cached until setFullScaleGyroRange or reset."""
+        if self.gyroScale is None:
+            self.gyroScale = (1 << self.getFullScaleGyroRange()) / 131.0
+        return self.gyroScale
     
-    def writeProgMemoryBlock(self, data, data_size, bank = 0, address = 0, verify = True):
-        return self.writeMemoryBlock(data, data_size, bank, address, verify, True)
+    def writeProgMemoryBlock(self, data, data_size, bank = 0, address = 0, verify = True, fast = False, strict = False):
+        return self.writeMemoryBlock(data, data_size, bank, address, verify, True, fast, strict)
     
-    def writeMemoryBlock(self, data, data_size, bank = 0, address = 0, verify = True, use_prog_mem = False):
+    def writeMemoryBlock(self, data, data_size, bank = 0, address = 0, verify = True, use_prog_mem = False, fast = False, strict = False):
+        """Write data_size bytes of data to DMP memory starting at bank/address.
+
+        fast uses writeMemoryBlockFast instead of the 16-byte chunk loop. Either
+        way, the time taken is left in memoryWriteReport.
+        """
+        start = time.perf_counter()
+        if fast:
+            result = self.writeMemoryBlockFast(data, data_size, bank, address, verify, strict)
+        else:
+            result = self._writeMemoryBlockChunked(data, data_size, bank, address, verify, use_prog_mem)
+        self.memoryWriteReport['mode'] = 'fast' if fast else 'chunked'
+        self.memoryWriteReport['bytes'] = data_size
+        self.memoryWriteReport['seconds'] = time.perf_counter() - start
+        return result
+
+    def writeMemoryBlockFast(self, data, data_size, bank = 0, address = 0, verify = True, strict = False):
+        """Write DMP memory with the largest block writes the bus allows.
+
+        The memory address auto-increments, so bank and start address are only
+        selected again when a block reaches a 256-byte bank boundary, and there is
+        no delay between blocks. Verification reads everything back in one pass
+        at the end; strict verifies each block right after writing it instead.
+        """
+        self.memoryWriteReport = {'verify_seconds': 0.0}
+        data = bytes(data[:data_size])
+        max_block_size = self.wireObj.MAX_BLOCK_SIZE
+        start_bank, start_address = bank, address
+
+        self.setMemoryBank(bank, False, False)
+        self.setMemoryStartAddress(address)
+        i = 0
+        while i < data_size:
+            chunk_size = min(max_block_size, data_size - i, self.MPU6050_DMP_MEMORY_BANK_SIZE - address)
+            self.wireObj.write_bytes(self.MPU6050_RA_MEM_R_W, data[i:i + chunk_size])
+
+            if verify and strict:
+                verify_start = time.perf_counter()
+                self.setMemoryBank(bank, False, False)
+                self.setMemoryStartAddress(address)
+                if bytes(self.wireObj.read_bytes(self.MPU6050_RA_MEM_R_W, chunk_size)) != data[i:i + chunk_size]:
+                    print(f"Block write verification error, bank {bank}, address {address}!")
+                    return False
+                self.memoryWriteReport['verify_seconds'] += time.perf_counter() - verify_start
+
+            i += chunk_size
+            address += chunk_size
+            if address == self.MPU6050_DMP_MEMORY_BANK_SIZE:
+                bank += 1
+                address = 0
+                if i < data_size:
+                    self.setMemoryBank(bank, False, False)
+                    self.setMemoryStartAddress(address)
+            elif verify and strict:
+                self.setMemoryStartAddress(address)
+
+        if verify and not strict:
+            verify_start = time.perf_counter()
+            readback = self.readMemoryBlock(data_size, start_bank, start_address)
+            self.memoryWriteReport['verify_seconds'] = time.perf_counter() - verify_start
+            if readback != data:
+                first = next(j for j in range(data_size) if readback[j] != data[j]) + start_address
+                print(f"Block write verification error, bank {start_bank + first // self.MPU6050_DMP_MEMORY_BANK_SIZE}, address {first % self.MPU6050_DMP_MEMORY_BANK_SIZE}!")
+                return False
+
+        return True
+
+    def readMemoryBlock(self, data_size, bank = 0, address = 0):
+        """Read data_size bytes of DMP memory starting at bank/address with maximal block reads."""
+        data = bytearray(data_size)
+        max_block_size = self.wireObj.MAX_BLOCK_SIZE
+
+        self.setMemoryBank(bank, False, False)
+        self.setMemoryStartAddress(address)
+        i = 0
+        while i < data_size:
+            chunk_size = min(max_block_size, data_size - i, self.MPU6050_DMP_MEMORY_BANK_SIZE - address)
+            data[i:i + chunk_size] = self.wireObj.read_bytes(self.MPU6050_RA_MEM_R_W, chunk_size)
+
+            i += chunk_size
+            address += chunk_size
+            if address == self.MPU6050_DMP_MEMORY_BANK_SIZE and i < data_size:
+                bank += 1
+                address = 0
+                self.setMemoryBank(bank, False, False)
+                self.setMemoryStartAddress(address)
+
+        return bytes(data)
+
+    def _writeMemoryBlockChunked(self, data, data_size, bank, address, verify, use_prog_mem):
+        self.memoryWriteReport = {}
         self.setMemoryBank(bank, False, False)
         self.setMemoryStartAddress(address)
         i = 0
@@ -506,11 +675,32 @@ class MPU6050_Base:
     def setFIFOEnabled(self, enabled):
         self.wireObj.write_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_FIFO_EN_BIT, enabled)
 
+    def getFIFOEnabled(self):
+        return self.wireObj.read_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_FIFO_EN_BIT)
+
+    def setTempFIFOEnabled(self, enabled):
+        self.wireObj.write_bit(self.MPU6050_RA_FIFO_EN, self.MPU6050_TEMP_FIFO_EN_BIT, enabled)
+
+    def setXGyroFIFOEnabled(self, enabled):
+        self.wireObj.write_bit(self.MPU6050_RA_FIFO_EN, self.MPU6050_XG_FIFO_EN_BIT, enabled)
+
+    def setYGyroFIFOEnabled(self, enabled):
+        self.wireObj.write_bit(self.MPU6050_RA_FIFO_EN, self.MPU6050_YG_FIFO_EN_BIT, enabled)
+
+    def setZGyroFIFOEnabled(self, enabled):
+        self.wireObj.write_bit(self.MPU6050_RA_FIFO_EN, self.MPU6050_ZG_FIFO_EN_BIT, enabled)
+
+    def setAccelFIFOEnabled(self, enabled):
+        self.wireObj.write_bit(self.MPU6050_RA_FIFO_EN, self.MPU6050_ACCEL_FIFO_EN_BIT, enabled)
+
     def resetDMP(self):
         self.wireObj.write_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_DMP_RESET_BIT, True)
 
     def setDMPEnabled(self, enabled):
         self.wireObj.write_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_DMP_EN_BIT, enabled)
+
+    def getDMPEnabled(self):
+        return self.wireObj.read_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_DMP_EN_BIT)
     
     def resetFIFO(self):
         self.wireObj.write_bit(self.MPU6050_RA_USER_CTRL, self.MPU6050_USERCTRL_FIFO_RESET_BIT, True)
@@ -518,6 +708,44 @@ class MPU6050_Base:
     def getIntStatus(self):
         return self.wireObj.read_byte(self.MPU6050_RA_INT_STATUS)
 
+    def setInterruptSource(self, source):
+        """Use source (see gpio_interrupt) to wait for the INT pin instead of polling; None to poll again."""
+        self.interrupt = source
+
+    def waitForInterrupt(self, timeout=None):
+        """Wait up to timeout seconds (forever if None) for an interrupt and return INT_STATUS, 0 on timeout.
+
+        With an interrupt source this blocks on the INT pin and reads INT_STATUS once
+        it fires. Without one, INT_STATUS is polled every MPU6050_INT_POLL_INTERVAL.
+        """
+        if self.interrupt is not None:
+            if not self.interrupt.wait(timeout):
+                return 0
+            return self.getIntStatus()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.getIntStatus()
+            if status:
+                return status
+            delay = self.MPU6050_INT_POLL_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return 0
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def _waitFIFO(self, BreakTimer):
+        # Block on the INT pin (or sleep) between FIFO count polls instead of spinning on the bus
+        remaining = (self.getFIFOTimeout() - (self.micros() - BreakTimer)) / 1_000_000
+        if remaining <= 0:
+            return
+        if self.interrupt is not None:
+            self.waitForInterrupt(remaining)
+        else:
+            time.sleep(min(self.fifoPollInterval, remaining))
+
     def initialize(self):
         self.setClockSource(self.MPU6050_CLOCK_PLL_XGYRO)
         self.setFullScaleGyroRange(self.MPU6050_GYRO_FS_250)
@@ -548,6 +776,7 @@ class MPU6050_Base:
                     fifoC = 0
                     
                     while (fifoC == 0) and ((self.micros() - BreakTimer) <= self.getFIFOTimeout()):  # Get Next New Packet
+                        self._waitFIFO(BreakTimer)
                         fifoC = self.getFIFOCount()
                 else:  # Less than 200 bytes of data in the FIFO Buffer
                     Trash = [0] * 32  # Assuming I2CDEVLIB_WIRE_BUFFER_LENGTH is defined
@@ -570,6 +799,8 @@ class MPU6050_Base:
             
             if packetReceived:
                 break
+
+            self._waitFIFO(BreakTimer)
         
         return self.getFIFOBytes(length)  # Get 1 packet
 
@@ -582,24 +813,30 @@ class MPU6050_Base:
         if length <= 0:
             return [0]  # Return a list with a single 0
 
-        # Ensure that we don't exceed the maximum block size
-        max_block_size = 32
-        data = []
-        
-        while length > 0:
-            # Determine how many bytes to read in this iteration
-            bytes_to_read = min(length, max_block_size)
-            
-            # Read the bytes and extend the data list
-            data.extend(self.wireObj.read_bytes(self.MPU6050_RA_FIFO_R_W, bytes_to_read))
-            
-            # Decrement the length by the number of bytes we just read
-            length -= bytes_to_read
-        
-        return data
+        return list(self.getFIFOBlock(length))
+
+    def getFIFOBlock(self, length, into=None):
+        """Read length bytes from the FIFO into one contiguous buffer using the largest block reads the bus allows.
+
+        With into (a preallocated bytearray of at least length bytes) the data
+        is read into it and a memoryview of the first length bytes is returned.
+        """
+        buffer = bytearray(length) if into is None else memoryview(into)[:length]
+        max_block_size = self.wireObj.MAX_BLOCK_SIZE
+        pos = 0
+
+        while pos < length:
+            bytes_to_read = min(length - pos, max_block_size)
+            buffer[pos:pos + bytes_to_read] = self.wireObj.read_bytes(self.MPU6050_RA_FIFO_R_W, bytes_to_read)
+            pos += bytes_to_read
+
+        return buffer
 
     def getFIFOTimeout(self):
-        return 1000
+        return self.fifoTimeout
+
+    def setFIFOTimeout(self, timeout):
+        self.fifoTimeout = timeout
 
     def setXGyroOffset(self, offset):
         self.wireObj.write_bytes(self.MPU6050_RA_XG_OFFS_USRH, struct.pack('>h', offset))
@@ -643,69 +880,98 @@ class MPU6050_Base:
         data = self.wireObj.read_bytes(self.MPU6050_RA_ZA_OFFS_H, 2)
         return struct.unpack('>h', data)[0]
 
-    def CalibrateGyro(self, loops):
+    def CalibrateGyro(self, loops, samples = 2):
         kP = 0.3
         kI = 90.0
         x = (100 - self.map_value(loops, 1, 5, 20, 0)) * 0.01
         kP *= x
         kI *= x
         
-        self.PID(0x43, kP, kI, loops)
+        return self.PID(0x43, kP, kI, loops, samples)
 
-    def CalibrateAccel(self, loops):
+    def CalibrateAccel(self, loops, samples = 2):
         kP = 0.3
         kI = 20.0
         x = (100 - self.map_value(loops, 1, 5, 20, 0)) * 0.01
         kP *= x
         kI *= x
         
-        self.PID(0x3B, kP, kI, loops)
+        return self.PID(0x3B, kP, kI, loops, samples)
+
+    def _readOffsetTriple(self, save_address, shift):
+        # one burst covering all three offset words, which sit shift bytes apart
+        data = bytes(self.wireObj.read_bytes(save_address, shift * 2 + 2))
+        return [struct.unpack_from('>h', data, i * shift)[0] for i in range(3)]
 
-    def PID(self, read_address, kP, kI, loops):
-        save_address = 0x06 if self.getDeviceId() < 0x38 else 0x77 if read_address == 0x3B else 0x13
+    def _writeOffsetTriple(self, save_address, shift, offsets):
+        if shift == 2:
+            self.wireObj.write_bytes(save_address, struct.pack('>3h', *offsets))
+        else: # registers in between the words are not ours to overwrite
+            for i in range(3):
+                self.wireObj.write_bytes(save_address + (i * shift), struct.pack('>h', offsets[i]))
+
+    def _readAxes(self, read_address, samples):
+        # all three axes in one burst, averaged over several bursts
+        totals = [0, 0, 0]
+        for _ in range(samples):
+            x, y, z = struct.unpack('>3h', bytes(self.wireObj.read_bytes(read_address, 6)))
+            totals[0] += x
+            totals[1] += y
+            totals[2] += z
+        return [total / samples for total in totals]
+
+    @staticmethod
+    def _pidOffset(value, divisor, bit_zero):
+        data = round(value / divisor)  # Compute PID Output
+        if bit_zero is not None:
+            data = (data & ~1) | bit_zero  # Insert Bit0
+        return max(-32768, min(32767, data))
+
+    def PID(self, read_address, kP, kI, loops, samples = 2):
+        """Closed-loop offset calibration ported from the Arduino library.
+
+        Every PI iteration reads the three axes in one burst (averaged over
+        `samples` bursts) and writes the three offsets in one block write, keeping
+        bit 0 of the accel offsets. Returns the number of PI iterations and the
+        wall time, also kept in calibrationReport.
+        """
+        start = time.perf_counter()
+        if read_address == 0x3B:
+            save_address = 0x06 if self.getDeviceId() < 0x38 else 0x77
+        else:
+            save_address = 0x13
 
-        bit_zero = [0] * 3
         shift = 3 if save_address == 0x77 else 2
-        error, p_term, i_term = [0] * 3, [0] * 3, [0] * 3
+        divisor = 4 if save_address == 0x13 else 8
+        i_term = [0] * 3
         gravity = 8192  # prevent uninitialized warning
         if read_address == 0x3B:
-            gravity = 16384 >> self.getFullScaleGyroRange()
+            gravity = 16384 >> self.getFullScaleAccelRange()
 
         print('>', end='')  # Serial write equivalent
+        offsets = self._readOffsetTriple(save_address, shift)
+        bit_zero = [offset & 1 if save_address != 0x13 else None for offset in offsets]  # Capture Bit Zero
         for i in range(3):
-            data = struct.unpack('>h', bytes(self.wireObj.read_bytes(save_address + (i * shift), 2)))[0]
-            reading = data
-            if save_address != 0x13:
-                bit_zero[i] = data & 1  # Capture Bit Zero
-                i_term[i] = reading * 8
-            else:
-                i_term[i] = reading * 4
-        
-        
+            i_term[i] = offsets[i] * divisor
 
+        iterations = 0
         for L in range(loops):
             e_sample = 0
             for c in range(100):  # 100 PI Calculations
+                iterations += 1
+                readings = self._readAxes(read_address, samples)
+                if read_address == 0x3B:
+                    readings[2] -= gravity  # Remove Gravity
                 e_sum = 0
                 for i in range(3):
-                    data = struct.unpack('>h', bytes(self.wireObj.read_bytes(read_address + (i * 2), 2)))[0]
-                    reading = data
-                    #print(data, end=" ")
-                    if (read_address == 0x3B) and (i == 2):
-                        reading -= gravity  # Remove Gravity
+                    reading = readings[i]
                     error = -reading
                     e_sum += abs(reading)
                     p_term = kP * error
                     i_term[i] += (error * 0.001) * kI  # Integral term
-                    if save_address != 0x13:
-                        data = round((p_term + i_term[i]) / 8)  # Compute PID Output
-                        data = (data & 0xFFFE) | bit_zero[i]  # Insert Bit0
-                    else:
-                        data = round((p_term + i_term[i]) / 4)
-                    self.wireObj.write_word(save_address + (i * shift), data)
-                #print()
+                    offsets[i] = self._pidOffset(p_term + i_term[i], divisor, bit_zero[i])
+                self._writeOffsetTriple(save_address, shift, offsets)
                 if (c == 99) and (e_sum > 1000):  # Error is still too great
-                    c = 0
                     print('*', end='')
                 if (e_sum * (0.05 if read_address == 0x3B else 1)) < 5:
                     e_sample += 1  # Successfully found offsets
@@ -715,38 +981,88 @@ class MPU6050_Base:
             print('.', end='')
             kP *= 0.75
             kI *= 0.75
-            for i in range(3):
-                if save_address != 0x13:
-                    data = round((i_term[i]) / 8)  # Compute PID Output
-                    data = (data & 0xFFFE) | bit_zero[i]  # Insert Bit0
-                else:
-                    data = round((i_term[i]) / 4)
-                self.wireObj.write_word(save_address + (i * shift), data)
+            self._writeOffsetTriple(save_address, shift, [self._pidOffset(i_term[i], divisor, bit_zero[i]) for i in range(3)])
         print()
         self.resetFIFO()
         self.resetDMP()
 
+        self.calibrationReport = {'iterations': iterations, 'seconds': time.perf_counter() - start}
+        return self.calibrationReport
+
     def map_value(self, value, from_low, from_high, to_low, to_high):
         """ Map a value from one range to another """
         return (value - from_low) * (to_high - to_low) / (from_high - from_low) + to_low
 
 
-    def getMotion6(self):
-        data = self.wireObj.read_bytes(59, 14)
-
-        gravity = 16384 >> self.getFullScaleAccelRange()
-
-        # Extracting the 3 16-bit integers
-        ax = struct.unpack('>h', bytes(data[:2]))[0]/gravity
-        ay = struct.unpack('>h', bytes(data[2:4]))[0]/gravity
-        az = struct.unpack('>h', bytes(data[4:6]))[0]/gravity
-
-        # Extracting the 3 16-bit integers
-        gx = struct.unpack('>h', bytes(data[8:10]))[0]/131
-        gy = struct.unpack('>h', bytes(data[10:12]))[0]/131
-        gz = struct.unpack('>h', bytes(data[12:14]))[0]/131
-
-        return [ax, ay, az, gx, gy, gz]
+    def getMotion6(self, into=None):
+        """Accel x, y, z in g and gyro x, y, z in deg/s from one burst read.
+
+        Scaled for the configured full-scale ranges (see getAccelScale). Written
+        into the list into when given, otherwise a new list is returned.
+        """
+        ax, ay, az, _, gx, gy, gz = self.getMotion7Raw()
+        a = self.getAccelScale()
+        g = self.getGyroScale()
+        if into is None:
+            return [ax * a, ay * a, az * a, gx * g, gy * g, gz * g]
+        into[0:6] = ax * a, ay * a, az * a, gx * g, gy * g, gz * g
+        return into
+
+    def getMotion6Raw(self, into=None):
+        """Raw accel x, y, z and gyro x, y, z readings from one burst read."""
+        ax, ay, az, _, gx, gy, gz = self.getMotion7Raw()
+        if into is None:
+            return [ax, ay, az, gx, gy, gz]
+        into[0:6] = ax, ay, az, gx, gy, gz
+        return into
+
+    def getMotion7(self, into=None):
+        """getMotion6 plus the die temperature in degrees Celsius, in register order:
+        accel x, y, z, temperature, gyro x, y, z.
+        """
+        ax, ay, az, t, gx, gy, gz = self.getMotion7Raw()
+        a = self.getAccelScale()
+        g = self.getGyroScale()
+        t = t * self.MPU6050_TEMP_SCALE + self.MPU6050_TEMP_OFFSET
+        if into is None:
+            return [ax * a, ay * a, az * a, t, gx * g, gy * g, gz * g]
+        into[0:7] = ax * a, ay * a, az * a, t, gx * g, gy * g, gz * g
+        return into
+
+    def getMotion7Raw(self):
+        """Raw accel x, y, z, temperature and gyro x, y, z as a tuple, from one 14-byte burst."""
+        return self.MOTION7.unpack(self.wireObj.read_bytes(self.MPU6050_RA_ACCEL_XOUT_H, 14))
+
+    def getAcceleration(self, into=None):
+        """Accel x, y, z in g."""
+        x, y, z = self.getAccelerationRaw()
+        a = self.getAccelScale()
+        if into is None:
+            return [x * a, y * a, z * a]
+        into[0:3] = x * a, y * a, z * a
+        return into
+
+    def getAccelerationRaw(self):
+        return self.WORDS3.unpack(self.wireObj.read_bytes(self.MPU6050_RA_ACCEL_XOUT_H, 6))
+
+    def getRotation(self, into=None):
+        """Gyro x, y, z in deg/s."""
+        x, y, z = self.getRotationRaw()
+        g = self.getGyroScale()
+        if into is None:
+            return [x * g, y * g, z * g]
+        into[0:3] = x * g, y * g, z * g
+        return into
+
+    def getRotationRaw(self):
+        return self.WORDS3.unpack(self.wireObj.read_bytes(self.MPU6050_RA_GYRO_XOUT_H, 6))
+
+    def getTemperature(self):
+        """Die temperature in degrees Celsius."""
+        return self.getTemperatureRaw() * self.MPU6050_TEMP_SCALE + self.MPU6050_TEMP_OFFSET
+
+    def getTemperatureRaw(self):
+        return self.WORD.unpack(self.wireObj.read_bytes(self.MPU6050_RA_TEMP_OUT_H, 2))[0]
 
     def PrintActiveOffsets(self):
         offsets = self.GetActiveOffsets()
@@ -754,6 +1070,14 @@ class MPU6050_Base:
             print(offset)
 
     def GetActiveOffsets(self):
-        return[ self.getXAccelOffset(), self.getYAccelOffset(), self.getZAccelOffset(), self.getXGyroOffset(), self.getYGyroOffset(), self.getZGyroOffset()]
+        # accel and gyro offsets are two runs of three consecutive big-endian words
+        accel = struct.unpack('>3h', bytes(self.wireObj.read_bytes(self.MPU6050_RA_XA_OFFS_H, 6)))
+        gyro = struct.unpack('>3h', bytes(self.wireObj.read_bytes(self.MPU6050_RA_XG_OFFS_USRH, 6)))
+        return [*accel, *gyro]
+
+    def SetActiveOffsets(self, offsets):
+        """Write accel x, y, z and gyro x, y, z offsets (as from GetActiveOffsets) with one block write each."""
+        self.wireObj.write_bytes(self.MPU6050_RA_XA_OFFS_H, struct.pack('>3h', *offsets[:3]))
+        self.wireObj.write_bytes(self.MPU6050_RA_XG_OFFS_USRH, struct.pack('>3h', *offsets[3:6]))
 
 
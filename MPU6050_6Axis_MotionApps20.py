@@ -1,6 +1,12 @@
+import hashlib
+import math
+import struct
+import time
+
 from MPU6050 import MPU6050_Base
 
-from helper_3dmath import Quaternion
+from helper_3dmath import Quaternion, Vector3
+from helper_dmp_packet import DMPPacket
 
 class MPU6050(MPU6050_Base): 
 
@@ -150,13 +156,117 @@ class MPU6050(MPU6050_Base):
 	0xB9, 0xA7, 0xF1, 0x26, 0x26, 0x26, 0xFE, 0xD8, 0xFF,
     ]
 
-    MPU6050_DMP_FIFO_RATE_DIVISOR = 0x01
-
-    def __init__(self, addr = MPU6050_Base.MPU6050_DEFAULT_ADDRESS):
-        super().__init__(addr)
+    MPU6050_DMP_FIFO_RATE_DIVISOR = 0x01 # default, see setDMPOutputRate
+    MPU6050_DMP_RATE_DIVISOR_ADDRESS = (0x02, 0x16) # bank, address of the 16-bit divisor
+    MPU6050_DMP_SMPLRT_DIV = 4 # the firmware fuses at 1kHz / (1 + 4) = 200 Hz
+    MPU6050_DMP_ACCEL_LSB = 8192 # accel in the DMP packet is +-2g no matter the accel range setting
+
+    # FIFO packet layouts: mode -> (packet size, gyro offset, accel offset), None when
+    # not sent. Every packet starts with the 16-byte quaternion and ends with a 2-byte footer.
+    DMP_PACKET_QUAT_GYRO_ACCEL = 'quat_gyro_accel'
+    DMP_PACKET_QUAT_ACCEL = 'quat_accel'
+    DMP_PACKET_QUAT = 'quat'
+    DMP_PACKET_LAYOUTS = {
+        DMP_PACKET_QUAT_GYRO_ACCEL: (42, 16, 28),
+        DMP_PACKET_QUAT_ACCEL: (30, None, 16),
+        DMP_PACKET_QUAT: (18, None, None),
+    }
+    # Bank 7 holds the instructions that push gyro (CFG_9) and accel (CFG_12) into
+    # the FIFO; replacing them with no-ops (0xA3) drops those words from the packet
+    MPU6050_DMP_CFG_GYRO_ADDRESS = (0x07, 0x47)
+    MPU6050_DMP_CFG_ACCEL_ADDRESS = (0x07, 0x6C)
+    MPU6050_DMP_SEND_3 = [0xF1, 0x28, 0x30, 0x38]
+    MPU6050_DMP_NOP_4 = [0xA3, 0xA3, 0xA3, 0xA3]
+
+    # Quaternion and accel from one packet in a single unpack, per layout (gyro words skipped)
+    DMP_QUAT = struct.Struct('>h2xh2xh2xh')
+    DMP_QUAT_ACCEL = {
+        DMP_PACKET_QUAT_GYRO_ACCEL: struct.Struct('>h2xh2xh2xh2x12xh2xh2xh'),
+        DMP_PACKET_QUAT_ACCEL: struct.Struct('>h2xh2xh2xh2xh2xh2xh'),
+    }
+    # Layout of the list dmpGetDerived returns
+    DMP_DERIVED_FIELDS = ('qw', 'qx', 'qy', 'qz', 'gravity_x', 'gravity_y', 'gravity_z', 'yaw', 'pitch', 'roll',
+                          'linear_x', 'linear_y', 'linear_z', 'world_x', 'world_y', 'world_z')
+
+    # Banks 0-2 hold DMP state that changes while it runs, so a loaded image is recognised by its program banks only
+    MPU6050_DMP_PROGRAM_START = 3 * MPU6050_Base.MPU6050_DMP_MEMORY_BANK_SIZE
+    MPU6050_DMP_PROGRAM_DIGEST = hashlib.sha256(bytes(dmpMemory[MPU6050_DMP_PROGRAM_START:MPU6050_DMP_CODE_SIZE])).hexdigest()
+
+    # Register state dmpInitialize leaves behind, as register: (mask, value)
+    MPU6050_DMP_WARM_CONFIG = {
+        MPU6050_Base.MPU6050_RA_PWR_MGMT_1:  (0x47, MPU6050_Base.MPU6050_CLOCK_PLL_ZGYRO), # awake, clock from Z gyro
+        MPU6050_Base.MPU6050_RA_INT_ENABLE:  (0xFF, 1 << MPU6050_Base.MPU6050_INTERRUPT_FIFO_OFLOW_BIT | 1 << MPU6050_Base.MPU6050_INTERRUPT_DMP_INT_BIT),
+        MPU6050_Base.MPU6050_RA_SMPLRT_DIV:  (0xFF, MPU6050_DMP_SMPLRT_DIV),
+        MPU6050_Base.MPU6050_RA_CONFIG:      (0x3F, MPU6050_Base.MPU6050_EXT_SYNC_TEMP_OUT_L << 3 | MPU6050_Base.MPU6050_DLPF_BW_42),
+        MPU6050_Base.MPU6050_RA_GYRO_CONFIG: (0x18, MPU6050_Base.MPU6050_GYRO_FS_2000 << 3),
+        MPU6050_Base.MPU6050_RA_MOT_THR:     (0xFF, 2),
+        MPU6050_Base.MPU6050_RA_MOT_DUR:     (0xFF, 80),
+        MPU6050_Base.MPU6050_RA_ZRMOT_THR:   (0xFF, 156),
+        MPU6050_Base.MPU6050_RA_ZRMOT_DUR:   (0xFF, 0),
+        MPU6050_Base.MPU6050_RA_USER_CTRL:   (1 << MPU6050_Base.MPU6050_USERCTRL_FIFO_EN_BIT, 1 << MPU6050_Base.MPU6050_USERCTRL_FIFO_EN_BIT),
+        MPU6050_Base.MPU6050_RA_DMP_CFG_1:   (0xFF, 0x03),
+        MPU6050_Base.MPU6050_RA_DMP_CFG_2:   (0xFF, 0x00),
+    }
+
+    def __init__(self, addr = MPU6050_Base.MPU6050_DEFAULT_ADDRESS, cache = False, bus = 0, smbus = None):
+        super().__init__(addr, cache, bus, smbus)
+        self.dmpPacketMode = self.DMP_PACKET_QUAT_GYRO_ACCEL
+        self.dmpPacketSize = 42
+        self.fifoOverflows = 0
+        self.receiveBuffer = bytearray(self.MPU6050_FIFO_SIZE) # reused by dmpGetPackets
+        self.dmpFIFORateDivisor = self.MPU6050_DMP_FIFO_RATE_DIVISOR
+        self.dmpOutputRate = None # cached dmpGetFIFORate(), see dmpGetOutputRate
     
 
-    def dmpInitialize(self):
+    def dmpIsLoaded(self):
+        """Check whether the DMP firmware and the dmpInitialize configuration survived since the last run.
+
+        Reads back the program banks and compares their digest with the embedded
+        image, then checks the configuration registers. The packet mode and the
+        output rate may differ from the defaults; dmpWarmStart adopts them.
+        """
+        program = bytearray(self.readMemoryBlock(self.MPU6050_DMP_CODE_SIZE - self.MPU6050_DMP_PROGRAM_START, self.MPU6050_DMP_PROGRAM_START // self.MPU6050_DMP_MEMORY_BANK_SIZE, 0))
+        if self._dmpPacketModeOf(program) is None:
+            return False
+        # the output selection is allowed to differ from the image, see dmpSetPacketMode
+        for bank, address in (self.MPU6050_DMP_CFG_GYRO_ADDRESS, self.MPU6050_DMP_CFG_ACCEL_ADDRESS):
+            start = bank * self.MPU6050_DMP_MEMORY_BANK_SIZE + address - self.MPU6050_DMP_PROGRAM_START
+            program[start:start + 4] = self.MPU6050_DMP_SEND_3
+        if hashlib.sha256(program).hexdigest() != self.MPU6050_DMP_PROGRAM_DIGEST:
+            return False
+
+        for register, (mask, value) in self.MPU6050_DMP_WARM_CONFIG.items():
+            if self.wireObj.read_byte(register) & mask != value:
+                return False
+        return True
+
+    def dmpWarmStart(self, enable = True):
+        """Resume a DMP that is still loaded and configured from a previous run.
+
+        Returns False, touching nothing, if dmpIsLoaded() fails. Otherwise the packet
+        mode and output rate left by the previous run are adopted, the FIFO is
+        reset, the DMP enabled (unless enable is False) and True returned.
+        """
+        if not self.dmpIsLoaded():
+            return False
+
+        self._setPacketLayout(self.dmpGetPacketMode())
+        self.dmpFIFORateDivisor = struct.unpack('>H', self.readMemoryBlock(2, *self.MPU6050_DMP_RATE_DIVISOR_ADDRESS))[0]
+        self._setOutputRate(self.dmpGetFIFORate())
+        self.setDMPEnabled(enable)
+        self.resetFIFO()
+        self.getIntStatus()
+        return True
+
+    def dmpInitialize(self, fast_upload = True, warm_start = True, packet_mode = None):
+        if warm_start:
+            print("Checking for DMP firmware from a previous run...")
+            if self.dmpWarmStart(False):
+                print("DMP firmware and configuration intact, skipping upload (you turn the DMP on later)")
+                if packet_mode is not None and packet_mode != self.dmpPacketMode:
+                    self.dmpSetPacketMode(packet_mode)
+                return 0
+
         # reset device
         print("\n\nResetting MPU6050...")
         super().reset()
@@ -206,7 +316,7 @@ class MPU6050(MPU6050_Base):
         super().setIntEnabled(1<<super().MPU6050_INTERRUPT_FIFO_OFLOW_BIT|1<<super().MPU6050_INTERRUPT_DMP_INT_BIT)
 
         print("Setting sample rate to 200Hz...")
-        super().setRate(4) # 1khz / (1 + 4) = 200 Hz
+        super().setRate(self.MPU6050_DMP_SMPLRT_DIV) # 1khz / (1 + 4) = 200 Hz
 
         print("Setting external frame sync to TEMP_OUT_L[0]...")
         super().setExternalFrameSync(super().MPU6050_EXT_SYNC_TEMP_OUT_L)
@@ -225,14 +335,15 @@ class MPU6050(MPU6050_Base):
         print("Writing DMP code to MPU memory banks (", end='')
         print(self.MPU6050_DMP_CODE_SIZE, end='')
         print(" bytes)")
-        if not super().writeProgMemoryBlock(self.dmpMemory, self.MPU6050_DMP_CODE_SIZE):
+        if not super().writeProgMemoryBlock(self.dmpMemory, self.MPU6050_DMP_CODE_SIZE, fast = fast_upload):
             print("Failed")
             return 1
         print("Success! DMP code written and verified.")
+        print(f"Upload took {self.memoryWriteReport['seconds'] * 1000:.1f} ms ({self.memoryWriteReport['mode']})")
 
         # Set the FIFO Rate Divisor int the DMP Firmware Memory
-        dmpUpdate = [0x00, self.MPU6050_DMP_FIFO_RATE_DIVISOR]
-        super().writeMemoryBlock(dmpUpdate, 0x02, 0x02, 0x16) # Lets write the dmpUpdate data to the Firmware image, we have 2 bytes to write in bank 0x02 with the Offset 0x16
+        dmpUpdate = [self.dmpFIFORateDivisor >> 8, self.dmpFIFORateDivisor & 0xFF]
+        super().writeMemoryBlock(dmpUpdate, 0x02, 0x02, 0x16, fast = fast_upload) # Lets write the dmpUpdate data to the Firmware image, we have 2 bytes to write in bank 0x02 with the Offset 0x16
 
         #write start address MSB into register
         super().setDMPConfig1(0x03)
@@ -264,8 +375,14 @@ class MPU6050(MPU6050_Base):
         print("Disabling DMP (you turn it on later)...")
         self.setDMPEnabled(False)
 
-        print("Setting up internal 42-byte (default) DMP packet buffer...")
-        self.dmpPacketSize = 42;
+        if packet_mode is None or packet_mode == self.DMP_PACKET_QUAT_GYRO_ACCEL:
+            print("Setting up internal 42-byte (default) DMP packet buffer...")
+            self._setPacketLayout(self.DMP_PACKET_QUAT_GYRO_ACCEL)
+        else:
+            print(f"Switching DMP output to {packet_mode} packets...")
+            self.dmpSetPacketMode(packet_mode)
+
+        self._setOutputRate(self.dmpGetFIFORate())
 
         print("Resetting FIFO and clearing INT status one last time...")
         super().resetFIFO()
@@ -276,25 +393,317 @@ class MPU6050(MPU6050_Base):
     def dmpGetFIFOPacketSize(self):
         return self.dmpPacketSize
 
+    def dmpSetPacketMode(self, mode):
+        """Choose what the DMP writes to the FIFO: one of DMP_PACKET_LAYOUTS.
+
+        DMP_PACKET_QUAT (18 bytes) or DMP_PACKET_QUAT_ACCEL (30 bytes) instead of
+        the default 42-byte quaternion + gyro + accel packets cut the bus traffic
+        per sample. The gyro and accel send instructions in DMP memory are patched
+        (dmpInitialize loads the default image, so call this afterwards or pass
+        packet_mode to it) and the FIFO is reset so no packet of the old layout is
+        left. The decoders follow the selected layout.
+        """
+        if mode not in self.DMP_PACKET_LAYOUTS:
+            raise ValueError(f"Unknown DMP packet mode {mode!r}, expected one of {list(self.DMP_PACKET_LAYOUTS)}")
+        _, gyro_offset, accel_offset = self.DMP_PACKET_LAYOUTS[mode]
+        for (bank, address), sent in ((self.MPU6050_DMP_CFG_GYRO_ADDRESS, gyro_offset is not None),
+                                      (self.MPU6050_DMP_CFG_ACCEL_ADDRESS, accel_offset is not None)):
+            if not self.writeMemoryBlock(self.MPU6050_DMP_SEND_3 if sent else self.MPU6050_DMP_NOP_4, 4, bank, address, fast = True):
+                raise OSError("DMP memory verification failed while setting the packet mode")
+        self._setPacketLayout(mode)
+        self.resetFIFO()
+
+    def dmpGetPacketMode(self):
+        """The packet mode the DMP program in memory is set up for, None if not recognised."""
+        gyro = self.readMemoryBlock(4, *self.MPU6050_DMP_CFG_GYRO_ADDRESS)
+        accel = self.readMemoryBlock(4, *self.MPU6050_DMP_CFG_ACCEL_ADDRESS)
+        return self._dmpPacketModeFromCFG(gyro, accel)
+
+    def _dmpPacketModeOf(self, program):
+        """dmpGetPacketMode for a copy of the program banks read back by dmpIsLoaded."""
+        def cfg(bank, address):
+            start = bank * self.MPU6050_DMP_MEMORY_BANK_SIZE + address - self.MPU6050_DMP_PROGRAM_START
+            return bytes(program[start:start + 4])
+        return self._dmpPacketModeFromCFG(cfg(*self.MPU6050_DMP_CFG_GYRO_ADDRESS), cfg(*self.MPU6050_DMP_CFG_ACCEL_ADDRESS))
+
+    def _dmpPacketModeFromCFG(self, gyro, accel):
+        sent = {bytes(self.MPU6050_DMP_SEND_3): True, bytes(self.MPU6050_DMP_NOP_4): False}
+        gyro, accel = sent.get(bytes(gyro)), sent.get(bytes(accel))
+        for mode, (_, gyro_offset, accel_offset) in self.DMP_PACKET_LAYOUTS.items():
+            if gyro is (gyro_offset is not None) and accel is (accel_offset is not None):
+                return mode
+        return None
+
+    def _setPacketLayout(self, mode):
+        self.dmpPacketMode = mode
+        self.dmpPacketSize = self.DMP_PACKET_LAYOUTS[mode][0]
+
     def dmpGetCurrentFIFOPacket(self):
         return super().GetCurrentFIFOPacket(self.dmpPacketSize)
 
+    def dmpGetFIFORate(self):
+        """DMP packet output rate in Hz: sample rate / (1 + FIFO rate divisor)."""
+        return self.getSampleRate() / (1 + self.dmpFIFORateDivisor)
+
+    def dmpGetOutputRate(self):
+        """dmpGetFIFORate, remembered so pollers can ask every loop without bus traffic."""
+        if self.dmpOutputRate is None:
+            self._setOutputRate(self.dmpGetFIFORate())
+        return self.dmpOutputRate
+
+    def setDMPOutputRate(self, hz):
+        """Change the DMP packet rate without re-initialising; returns the effective rate in Hz.
+
+        The DMP firmware fuses at 200 Hz, so SMPLRT_DIV is (re)written to that
+        and hz is reached through the FIFO rate divisor in DMP memory: 200, 100,
+        66.7, 50, 40 ... Hz (200 / (1 + divisor)). The nearest achievable rate
+        is used; ValueError is raised for rates outside 200 Hz / 65536 to 200 Hz.
+        The FIFO timeout and the poll interval of packets() and the acquisition
+        workers follow the new rate, and the FIFO is reset.
+        """
+        if self.getRate() != self.MPU6050_DMP_SMPLRT_DIV:
+            super().setRate(self.MPU6050_DMP_SMPLRT_DIV)
+        sample_rate = self.getSampleRate()
+        if not sample_rate / 0x10000 <= hz <= sample_rate:
+            raise ValueError(f"DMP output rate must be between {sample_rate / 0x10000:.4f} and {sample_rate:g} Hz, got {hz}")
+
+        divisor = max(0, min(0xFFFF, round(sample_rate / hz) - 1))
+        if not self.writeMemoryBlock([divisor >> 8, divisor & 0xFF], 2, *self.MPU6050_DMP_RATE_DIVISOR_ADDRESS, fast = True):
+            raise OSError("DMP memory verification failed while setting the output rate")
+        self.dmpFIFORateDivisor = divisor
+        self._setOutputRate(sample_rate / (1 + divisor))
+        self.resetFIFO()
+        return self.dmpOutputRate
+
+    def _setOutputRate(self, rate):
+        self.dmpOutputRate = rate
+        # long enough for the next packet to arrive after a FIFO reset (11 ms at 100 Hz);
+        # without an interrupt source the count is polled a few times per packet meanwhile
+        self.setFIFOTimeout(max(1000, int(1.1e6 / rate)))
+        self.fifoPollInterval = max(self.MPU6050_INT_POLL_INTERVAL, 0.25 / rate)
+
+    def setRate(self, rate):
+        super().setRate(rate)
+        self.dmpOutputRate = None
+
+    def setDLPFMode(self, mode):
+        super().setDLPFMode(mode)
+        self.dmpOutputRate = None
+
+    def dmpGetNextFIFOPacket(self, timeout=1.0):
+        """Wait up to timeout seconds for the next packet, sleeping on the INT pin (or INT_STATUS polls) meanwhile; 0 on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            packet = self.dmpGetCurrentFIFOPacket()
+            if packet:
+                return packet
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return 0
+            self.waitForInterrupt(remaining)
+
+    def drainFIFO(self, max_packets=None, into=None):
+        """Read every complete DMP packet waiting in the FIFO (at most max_packets).
+
+        The FIFO count is read once and all whole packets are fetched with as few
+        block reads as possible into one buffer (a new one, or into when given);
+        a trailing partial packet stays in the FIFO for the next call. Returns a
+        list of memoryviews, one per packet, oldest first. An overflowed FIFO is
+        no longer packet aligned, so it is reset, counted in fifoOverflows and
+        nothing is returned.
+        """
+        fifoC = self.getFIFOCount()
+        if fifoC >= self.MPU6050_FIFO_SIZE:
+            self.resetFIFO()
+            self.fifoOverflows += 1
+            return []
+
+        count = fifoC // self.dmpPacketSize
+        if max_packets is not None:
+            count = min(count, max_packets)
+        if count <= 0:
+            return []
+
+        length = count * self.dmpPacketSize
+        buffer = memoryview(self.getFIFOBlock(length, into))
+        return [buffer[i:i + self.dmpPacketSize] for i in range(0, length, self.dmpPacketSize)]
+
+    def dmpGetAllFIFOPackets(self):
+        return self.drainFIFO()
+
+    def dmpGetPackets(self, max_packets=None):
+        """drainFIFO into the reused receiveBuffer, returning DMPPacket views.
+
+        Nothing is copied or decoded up front. The packets are only valid until
+        the next dmpGetPackets call; use DMPPacket.copy() to keep one longer.
+        """
+        _, gyro_offset, accel_offset = self.DMP_PACKET_LAYOUTS[self.dmpPacketMode]
+        return [DMPPacket(view, gyro_offset, accel_offset) for view in self.drainFIFO(max_packets, self.receiveBuffer)]
+
+    def packets(self, batch=1, timeout=None):
+        """Yield raw DMP packets as they arrive.
+
+        The FIFO is drained every `batch` packet periods (at the rate from
+        dmpGetOutputRate) and the generator sleeps in between instead of polling.
+        With an interrupt source set, an empty drain blocks on the INT pin instead.
+        It ends once no packet arrived for `timeout` seconds, or when closed.
+        """
+        # stay well clear of a FIFO overflow between two drains
+        batch = max(1, min(batch, self.MPU6050_FIFO_SIZE // self.dmpPacketSize // 2))
+
+        last_packet = next_poll = time.monotonic()
+        while True:
+            interval = batch / self.dmpGetOutputRate() # follows setDMPOutputRate
+            packets = self.drainFIFO()
+            if packets:
+                last_packet = time.monotonic()
+                yield from packets
+            else:
+                idle = time.monotonic() - last_packet
+                if timeout is not None and idle > timeout:
+                    return
+                if self.interrupt is not None:
+                    self.waitForInterrupt(None if timeout is None else timeout - idle)
+                    next_poll = time.monotonic()
+                    continue
+
+            next_poll += interval
+            delay = next_poll - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.monotonic() # consumer fell behind, don't try to catch up
+
+    def stream(self, decode=None, batch=1, timeout=None):
+        """Yield decoded samples as they arrive, dmpGetQuaternion unless another decode(packet) is given."""
+        if decode is None:
+            decode = self.dmpGetQuaternion
+        for packet in self.packets(batch, timeout):
+            yield decode(packet)
+
     def dmpGetQuaternionRaw(self, packet=None):
         data = [0,0,0,0]
-        data[0] = (packet[0] << 8) | packet[1]
-        data[1] = (packet[4] << 8) | packet[5]
-        data[2] = (packet[8] << 8) | packet[9]
-        data[3] = (packet[12] << 8) | packet[13]
+        data[0] = ((packet[0] << 8) | packet[1]) - ((packet[0] & 0x80) << 9)
+        data[1] = ((packet[4] << 8) | packet[5]) - ((packet[4] & 0x80) << 9)
+        data[2] = ((packet[8] << 8) | packet[9]) - ((packet[8] & 0x80) << 9)
+        data[3] = ((packet[12] << 8) | packet[13]) - ((packet[12] & 0x80) << 9)
 
         return data
 
-    def dmpGetQuaternion(self, packet=None):
-        data = [0,0,0,0]
-        data[0] = (packet[0] << 8) | packet[1]
-        data[1] = (packet[4] << 8) | packet[5]
-        data[2] = (packet[8] << 8) | packet[9]
-        data[3] = (packet[12] << 8) | packet[13]
+    def dmpGetQuaternion(self, packet=None, out=None):
+        """Quaternion from a DMP packet, written into out (a Quaternion) when given."""
+        if isinstance(packet, DMPPacket):
+            return packet.quaternion(out)
+        return Quaternion.from_buffer(packet, 0, 1 / 16384.0, out)
+
+    def dmpGetGravity(self, q, out=None):
+        """Gravity direction in the sensor frame (in g) from a quaternion, into out (a Vector3) when given."""
+        if out is None:
+            out = Vector3()
+        return out.set(2 * (q.x * q.z - q.w * q.y),
+                       2 * (q.w * q.x + q.y * q.z),
+                       q.w * q.w - q.x * q.x - q.y * q.y + q.z * q.z)
+
+    def dmpGetEuler(self, q):
+        """[psi, theta, phi] in radians."""
+        return [math.atan2(2 * q.x * q.y - 2 * q.w * q.z, 2 * q.w * q.w + 2 * q.x * q.x - 1),
+                -math.asin(max(-1.0, min(1.0, 2 * q.x * q.z + 2 * q.w * q.y))),
+                math.atan2(2 * q.y * q.z - 2 * q.w * q.x, 2 * q.w * q.w + 2 * q.z * q.z - 1)]
+
+    def dmpGetYawPitchRoll(self, q, gravity=None):
+        """[yaw, pitch, roll] in radians; gravity (from dmpGetGravity) is computed when not given."""
+        if gravity is None:
+            gravity = self.dmpGetGravity(q)
+        return self._yawPitchRoll(q.w, q.x, q.y, q.z, gravity.x, gravity.y, gravity.z)
+
+    @staticmethod
+    def _yawPitchRoll(qw, qx, qy, qz, gx, gy, gz):
+        yaw = math.atan2(2 * qx * qy - 2 * qw * qz, 2 * qw * qw + 2 * qx * qx - 1)
+        pitch = math.atan2(gx, math.sqrt(gy * gy + gz * gz))
+        roll = math.atan2(gy, gz)
+        if gz < 0: # upside down: continue pitch past +-90 degrees
+            pitch = (math.pi if pitch > 0 else -math.pi) - pitch
+        return [yaw, pitch, roll]
+
+    def dmpGetLinearAccel(self, accel, gravity):
+        """Raw DMP accel (from dmpGetAccel) with gravity removed, in DMP accel units."""
+        lsb = self.MPU6050_DMP_ACCEL_LSB
+        return [accel[0] - gravity.x * lsb, accel[1] - gravity.y * lsb, accel[2] - gravity.z * lsb]
+
+    def dmpGetLinearAccelInWorld(self, linear, q):
+        """Linear accel (from dmpGetLinearAccel) rotated from the sensor into the world frame."""
+        v = Vector3(*linear).rotate(q)
+        return [v.x, v.y, v.z]
+
+    def dmpGetDerived(self, packet, out=None, world=True):
+        """Everything the helpers above compute, from one packet in a single pass.
+
+        Decodes quaternion and accel with one struct unpack and computes gravity,
+        yaw/pitch/roll, linear accel and (unless world is False) linear accel in
+        the world frame without building intermediate Quaternion/Vector3 objects.
+        Returns a list laid out as DMP_DERIVED_FIELDS, reusing out when given. In
+        DMP_PACKET_QUAT mode there is no accel and the accel fields are None.
+        """
+        if isinstance(packet, DMPPacket):
+            packet = packet.buffer
+        elif not isinstance(packet, (bytes, bytearray, memoryview)):
+            packet = bytes(packet)
+        unpacker = self.DMP_QUAT_ACCEL.get(self.dmpPacketMode)
+        if unpacker is None:
+            qw, qx, qy, qz = self.DMP_QUAT.unpack_from(packet)
+        else:
+            qw, qx, qy, qz, ax, ay, az = unpacker.unpack_from(packet)
+        qw /= 16384.0
+        qx /= 16384.0
+        qy /= 16384.0
+        qz /= 16384.0
+
+        gx = 2 * (qx * qz - qw * qy)
+        gy = 2 * (qw * qx + qy * qz)
+        gz = qw * qw - qx * qx - qy * qy + qz * qz
+        yaw, pitch, roll = self._yawPitchRoll(qw, qx, qy, qz, gx, gy, gz)
+
+        lx = ly = lz = wx = wy = wz = None
+        if unpacker is not None:
+            lsb = self.MPU6050_DMP_ACCEL_LSB
+            lx = ax - gx * lsb
+            ly = ay - gy * lsb
+            lz = az - gz * lsb
+
+            if world: # same expansion as Vector3.rotate
+                s = qw * qw - (qx * qx + qy * qy + qz * qz)
+                d = 2 * (qx * lx + qy * ly + qz * lz)
+                w2 = 2 * qw
+                wx = s * lx + d * qx + w2 * (qy * lz - qz * ly)
+                wy = s * ly + d * qy + w2 * (qz * lx - qx * lz)
+                wz = s * lz + d * qz + w2 * (qx * ly - qy * lx)
+
+        if out is None:
+            return [qw, qx, qy, qz, gx, gy, gz, yaw, pitch, roll, lx, ly, lz, wx, wy, wz]
+        out[:] = (qw, qx, qy, qz, gx, gy, gz, yaw, pitch, roll, lx, ly, lz, wx, wy, wz)
+        return out
+
+    def _packetOffset(self, field):
+        layout = self.DMP_PACKET_LAYOUTS[self.dmpPacketMode]
+        offset = layout[1] if field == 'gyro' else layout[2]
+        if offset is None:
+            raise ValueError(f"DMP packets in {self.dmpPacketMode} mode carry no {field}")
+        return offset
+
+    def dmpGetGyro(self, packet=None):
+        i = self._packetOffset('gyro')
+        data = [0,0,0]
+        data[0] = ((packet[i] << 8) | packet[i + 1]) - ((packet[i] & 0x80) << 9)
+        data[1] = ((packet[i + 4] << 8) | packet[i + 5]) - ((packet[i + 4] & 0x80) << 9)
+        data[2] = ((packet[i + 8] << 8) | packet[i + 9]) - ((packet[i + 8] & 0x80) << 9)
 
-        quat = Quaternion( ((data[0] - 32768) / 32768), ((data[1] - 32768) / 32768), ((data[2] - 32768) / 32768), ((data[3] - 32768) / 32768) )
+        return data
+
+    def dmpGetAccel(self, packet=None):
+        i = self._packetOffset('accel')
+        data = [0,0,0]
+        data[0] = ((packet[i] << 8) | packet[i + 1]) - ((packet[i] & 0x80) << 9)
+        data[1] = ((packet[i + 4] << 8) | packet[i + 5]) - ((packet[i + 4] & 0x80) << 9)
+        data[2] = ((packet[i + 8] << 8) | packet[i + 9]) - ((packet[i + 8] & 0x80) << 9)
 
-        return quat
\ No newline at end of file
+        return data
@@ -0,0 +1,201 @@
+import threading
+import time
+from array import array
+
+
+class PacketRing:
+    """Fixed-capacity ring of equally sized packets in one preallocated buffer.
+
+    There is a single writer (the acquisition thread) and any number of readers.
+    No lock is taken: the writer marks a slot as busy before overwriting it and
+    publishes the packet's sequence number afterwards, and readers re-check that
+    sequence number after copying, dropping packets overwritten mid-copy.
+    """
+    def __init__(self, capacity, packet_size):
+        self.capacity = capacity
+        self.packet_size = packet_size
+        self._data = bytearray(capacity * packet_size)
+        self._seq = array('q', [-1]) * capacity
+        self._time = array('d', [0.0]) * capacity
+        self.head = 0 # sequence number the next packet will get
+
+    def append(self, packet, timestamp):
+        seq = self.head
+        slot = seq % self.capacity
+        start = slot * self.packet_size
+        self._seq[slot] = -1
+        self._data[start:start + self.packet_size] = packet
+        self._time[slot] = timestamp
+        self._seq[slot] = seq
+        self.head = seq + 1
+
+    def write(self, buffer, count, timestamp, period):
+        """Append count packets stored back to back in buffer, oldest first.
+
+        The newest is stamped timestamp and each earlier one period before it.
+        The data goes in with at most two slice copies (one at the wrap); the
+        slots are marked busy first and published afterwards, as in append.
+        """
+        size = self.packet_size
+        capacity = self.capacity
+        view = memoryview(buffer)
+        if count > capacity: # only the newest capacity packets would survive
+            skip = count - capacity
+            self.head += skip
+            view = view[skip * size:]
+            count = capacity
+        seq = self.head
+        slot = seq % capacity
+        for i in range(count):
+            self._seq[(slot + i) % capacity] = -1
+
+        first = min(count, capacity - slot)
+        self._data[slot * size:(slot + first) * size] = view[:first * size]
+        if count > first:
+            self._data[:(count - first) * size] = view[first * size:count * size]
+
+        last = count - 1
+        for i in range(count):
+            index = (slot + i) % capacity
+            self._time[index] = timestamp - (last - i) * period
+            self._seq[index] = seq + i
+        self.head = seq + count
+
+    def get(self, seq):
+        """Return (seq, timestamp, packet bytes), or None if seq is not (or no longer) in the ring."""
+        slot = seq % self.capacity
+        if self._seq[slot] != seq:
+            return None
+        start = slot * self.packet_size
+        packet = bytes(self._data[start:start + self.packet_size])
+        timestamp = self._time[slot]
+        if self._seq[slot] != seq:
+            return None
+        return seq, timestamp, packet
+
+    def latest(self):
+        head = self.head
+        if head == 0:
+            return None
+        return self.get(head - 1)
+
+    def last(self, n):
+        """Return up to n of the newest packets as (seq, timestamp, packet), oldest first."""
+        head = self.head
+        first = max(0, head - min(n, self.capacity))
+        return [item for item in map(self.get, range(first, head)) if item is not None]
+
+    def nearest(self, timestamp):
+        """Return the (seq, timestamp, packet) closest in time to timestamp, None if there is none.
+
+        Binary search over the slot timestamps, so only the chosen packet is copied.
+        """
+        head = self.head
+        first = max(0, head - self.capacity)
+        times = self._time
+        lo, hi = first, head
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[mid % self.capacity] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        # lo is the first packet at or after timestamp; the one before it may be closer
+        candidates = [seq for seq in (lo - 1, lo) if first <= seq < head]
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda seq: abs(times[seq % self.capacity] - timestamp))
+        return self.get(best)
+
+    def read(self, since):
+        """Return (packets with sequence >= since, next since, number of packets already overwritten)."""
+        head = self.head
+        first = max(since, head - self.capacity)
+        packets = [item for item in map(self.get, range(first, head)) if item is not None]
+        missed = (head - since) - len(packets)
+        return packets, head, missed
+
+
+def drain_into(device, ring, period, buffer):
+    """Drain every complete packet from device's FIFO into ring; returns the number of packets.
+
+    The packets are read into buffer (a preallocated bytearray of at least
+    MPU6050_FIFO_SIZE bytes) and copied from there into the ring, so nothing
+    is allocated per packet. Overflow is handled as in drainFIFO.
+    """
+    fifoC = device.getFIFOCount()
+    if fifoC >= device.MPU6050_FIFO_SIZE:
+        device.resetFIFO()
+        device.fifoOverflows += 1
+        return 0
+    count = fifoC // ring.packet_size
+    if count:
+        device.getFIFOBlock(count * ring.packet_size, buffer)
+        ring.write(buffer, count, time.monotonic(), period)
+    return count
+
+
+class AcquisitionThread(threading.Thread):
+    """Background worker that continuously drains the DMP FIFO into a PacketRing.
+
+    While running the worker owns the device: other threads should only use
+    the ring (latest, last, read_new) and not touch the bus themselves.
+    Packets are timestamped with the host monotonic clock at the drain,
+    spaced back by one packet period within a batch.
+    """
+    def __init__(self, device, capacity=1024, batch=4):
+        super().__init__(name='mpu6050-acquisition', daemon=True)
+        self.device = device
+        self.ring = PacketRing(capacity, device.dmpGetFIFOPacketSize())
+        # drain well before the 1024-byte FIFO can overflow
+        self.batch = max(1, min(batch, device.MPU6050_FIFO_SIZE // device.dmpGetFIFOPacketSize() // 2))
+        self.overruns = 0
+        self._buffer = bytearray(device.MPU6050_FIFO_SIZE) # drain_into reads the FIFO through it
+        self._cursor = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        device = self.device
+        ring = self.ring
+
+        while not self._stop_event.is_set():
+            period = 1 / device.dmpGetOutputRate() # follows setDMPOutputRate
+            interval = period * self.batch
+            received = drain_into(device, ring, period, self._buffer)
+
+            if device.interrupt is not None and not received:
+                device.waitForInterrupt(interval)
+            else:
+                self._stop_event.wait(interval)
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def latest(self):
+        """Newest packet as (seq, timestamp, packet), or None before the first one."""
+        return self.ring.latest()
+
+    def last(self, n):
+        return self.ring.last(n)
+
+    def read_new(self):
+        """Return the packets acquired since the previous read_new() call.
+
+        Packets overwritten before they could be read are added to overruns.
+        """
+        packets, self._cursor, missed = self.ring.read(self._cursor)
+        self.overruns += missed
+        return packets
+
+    @property
+    def fifo_overflows(self):
+        return self.device.fifoOverflows
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
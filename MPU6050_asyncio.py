@@ -0,0 +1,115 @@
+import asyncio
+import collections
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from MPU6050 import MPU6050_Base
+from MPU6050_6Axis_MotionApps20 import MPU6050
+
+
+class AsyncMPU6050:
+    """asyncio front-end for MPU6050_6Axis_MotionApps20.MPU6050.
+
+    All bus I/O for one device runs on its own worker thread, so calls are
+    serialized and never block the event loop. Packets are fetched in whole
+    FIFO drains and handed out one at a time from a local queue.
+    """
+    def __init__(self, addr = MPU6050_Base.MPU6050_DEFAULT_ADDRESS, cache = False, device = None):
+        self.device = device if device is not None else MPU6050(addr, cache)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'mpu6050-{addr:#04x}')
+        self._pending = collections.deque()
+        self._inflight = None # drain still running on the worker after next_packet timed out
+
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking device method on the worker thread and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def initialize(self):
+        return await self.call(self.device.initialize)
+
+    async def dmp_initialize(self):
+        self._pending.clear()
+        self._inflight = None
+        return await self.call(self.device.dmpInitialize)
+
+    async def set_dmp_output_rate(self, hz):
+        """setDMPOutputRate on the worker thread; returns the effective rate."""
+        self._pending.clear()
+        self._inflight = None
+        return await self.call(self.device.setDMPOutputRate, hz)
+
+    async def drain(self, max_packets=None):
+        """Fetch every complete packet currently in the FIFO in one worker round trip."""
+        return await self.call(self.device.drainFIFO, max_packets)
+
+    async def _wait_for_data(self):
+        interrupt = self.device.interrupt
+        if interrupt is None:
+            rate = self.device.dmpOutputRate # plain attribute, safe to read from the loop
+            if rate is None:
+                rate = await self.call(self.device.dmpGetOutputRate)
+            await asyncio.sleep(1 / rate)
+            return
+
+        # Let the loop watch the INT pin fd instead of blocking a thread on it
+        loop = asyncio.get_running_loop()
+        fired = loop.create_future()
+        def on_readable():
+            interrupt.wait(0)
+            if not fired.done():
+                fired.set_result(None)
+        loop.add_reader(interrupt.fileno(), on_readable)
+        try:
+            await fired
+        finally:
+            loop.remove_reader(interrupt.fileno())
+
+    async def next_packet(self, timeout=None):
+        """Return the next packet, waiting up to timeout seconds (forever if None); 0 on timeout."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._fill(), timeout)
+            except asyncio.TimeoutError:
+                return 0
+        return self._pending.popleft()
+
+    async def _fill(self):
+        # A timeout cancels this coroutine but not the drainFIFO running on the
+        # worker, which takes its packets out of the FIFO regardless. Its future
+        # is only dropped once the result is in hand, so after a cancellation
+        # (even one racing the result) the next call collects those packets
+        while True:
+            if self._inflight is None:
+                loop = asyncio.get_running_loop()
+                self._inflight = loop.run_in_executor(self._executor, self.device.drainFIFO, None)
+            try:
+                packets = await asyncio.shield(self._inflight)
+            except Exception:
+                self._inflight = None
+                raise
+            self._inflight = None
+            if packets:
+                self._pending.extend(packets)
+                return
+            await self._wait_for_data()
+
+    async def packets(self, timeout=None):
+        """Async generator of packets; ends once none arrived for timeout seconds."""
+        while True:
+            packet = await self.next_packet(timeout)
+            if not packet:
+                return
+            yield packet
+
+    def __aiter__(self):
+        return self.packets()
+
+    async def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+
+def device_identity(device):
+    """Fingerprint of a chip from its factory trim: self-test values and gyro offset TC bits."""
+    self_test = device.wireObj.read_bytes(device.MPU6050_RA_SELF_TEST_X, 4)
+    offset_tc = [value & 0x7E for value in device.wireObj.read_bytes(device.MPU6050_RA_XG_OFFS_TC, 3)] # bit 0 is OTP_BNK_VLD
+    return bytes(self_test).hex() + bytes(offset_tc).hex()
+
+
+class CalibrationStore:
+    """Offsets from previous calibrations, saved in a JSON file.
+
+    Entries are keyed by bus, address and device_identity, and remember the die
+    temperature at calibration time. apply() reloads stored offsets and only
+    runs the PID calibration again when a quick residual check fails.
+    """
+    DEFAULT_PATH = os.path.expanduser('~/.mpu6050_calibration.json')
+
+    def __init__(self, path = DEFAULT_PATH, accel_threshold = 0.03, gyro_threshold = 1.0, temperature_threshold = 10.0, samples = 50):
+        self.path = path
+        self.accel_threshold = accel_threshold # g
+        self.gyro_threshold = gyro_threshold # deg/s
+        self.temperature_threshold = temperature_threshold # deg C
+        self.samples = samples
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, entries):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def key(self, device):
+        return f'{device.bus}:{device.addr:#04x}:{device_identity(device)}'
+
+    def save(self, device):
+        entries = self._read()
+        entries[self.key(device)] = {
+            'offsets': device.GetActiveOffsets(),
+            'temperature': device.getTemperature(),
+            'saved': time.time(),
+        }
+        self._write(entries)
+
+    def load(self, device):
+        """Write the stored offsets to the device; returns the entry, or None if there is none."""
+        entry = self._read().get(self.key(device))
+        if entry is not None:
+            device.SetActiveOffsets(entry['offsets'])
+        return entry
+
+    def residual(self, device):
+        """Largest mean accel error (g) and gyro rate (deg/s) of a device lying flat and still, Z up."""
+        sums = [0] * 6
+        for _ in range(self.samples):
+            for i, value in enumerate(device.getMotion6Raw()):
+                sums[i] += value
+            time.sleep(0.001)
+
+        accel_lsb = 16384 >> device.getFullScaleAccelRange()
+        gyro_lsb = 131.0 / (1 << device.getFullScaleGyroRange())
+        mean = [total / self.samples for total in sums]
+        accel = max(abs(mean[0]), abs(mean[1]), abs(mean[2] - accel_lsb)) / accel_lsb
+        gyro = max(abs(value) for value in mean[3:]) / gyro_lsb
+        return accel, gyro
+
+    def apply(self, device, loops = 6):
+        """Restore stored offsets or calibrate; returns 'stored' or 'calibrated'."""
+        entry = self.load(device)
+        if entry is not None and abs(device.getTemperature() - entry['temperature']) <= self.temperature_threshold:
+            accel, gyro = self.residual(device)
+            if accel <= self.accel_threshold and gyro <= self.gyro_threshold:
+                return 'stored'
+
+        device.CalibrateAccel(loops)
+        device.CalibrateGyro(loops)
+        self.save(device)
+        return 'calibrated'
@@ -0,0 +1,170 @@
+import threading
+
+import smbus2
+
+from MPU6050_6Axis_MotionApps20 import MPU6050
+from MPU6050_acquisition import PacketRing, drain_into
+
+
+class SharedBus:
+    """One open /dev/i2c-N handle shared by several devices.
+
+    smbus2 selects the slave address per call, so every transaction is done
+    under a lock to keep devices on the same bus from interleaving.
+    """
+    def __init__(self, bus):
+        self.bus = bus
+        self.smbus = smbus2.SMBus(bus=bus)
+        self.lock = threading.RLock()
+
+    def read_byte_data(self, i2c_addr, register, force=None):
+        with self.lock:
+            return self.smbus.read_byte_data(i2c_addr, register, force)
+
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        with self.lock:
+            return self.smbus.write_byte_data(i2c_addr, register, value, force)
+
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        with self.lock:
+            return self.smbus.read_i2c_block_data(i2c_addr, register, length, force)
+
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        with self.lock:
+            return self.smbus.write_i2c_block_data(i2c_addr, register, data, force)
+
+    def read_word_data(self, i2c_addr, register, force=None):
+        with self.lock:
+            return self.smbus.read_word_data(i2c_addr, register, force)
+
+    def write_word_data(self, i2c_addr, register, value, force=None):
+        with self.lock:
+            return self.smbus.write_word_data(i2c_addr, register, value, force)
+
+    def close(self):
+        with self.lock:
+            self.smbus.close()
+
+
+class BusPool:
+    """Opens each I2C bus once and hands out the shared handle."""
+    def __init__(self):
+        self._buses = {}
+        self._lock = threading.Lock()
+
+    def get(self, bus):
+        with self._lock:
+            shared = self._buses.get(bus)
+            if shared is None:
+                shared = self._buses[bus] = SharedBus(bus)
+            return shared
+
+    def close(self):
+        with self._lock:
+            for shared in self._buses.values():
+                shared.close()
+            self._buses.clear()
+
+
+class BusWorker(threading.Thread):
+    """Drains the FIFO of every device on one bus into its ring."""
+    def __init__(self, bus, devices, rings, batch):
+        super().__init__(name=f'mpu6050-bus{bus}', daemon=True)
+        self.devices = devices
+        self.rings = rings
+        self.batch = batch
+        self._buffer = bytearray(MPU6050.MPU6050_FIFO_SIZE) # shared by the devices, drained one at a time
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            periods = {key: 1 / device.dmpGetOutputRate() for key, device in self.devices.items()}
+            interval = min(periods.values()) * self.batch
+            for key, device in self.devices.items():
+                drain_into(device, self.rings[key], periods[key], self._buffer)
+            self._stop_event.wait(interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class SensorGroup:
+    """Several MPU6050s across one or more buses, sampled in parallel.
+
+    Devices are keyed by (bus, address). Each bus is opened once and shared,
+    and start() runs one BusWorker per bus so buses are drained concurrently.
+    """
+    def __init__(self, pool=None, capacity=1024, batch=4):
+        self.pool = pool if pool is not None else BusPool()
+        self.capacity = capacity
+        self.batch = batch
+        self.devices = {}
+        self.rings = {}
+        self._workers = []
+
+    def add(self, bus, addr, cache=False):
+        """Create the device at addr on bus and return it (initialize it before start())."""
+        device = MPU6050(addr, cache, bus, self.pool.get(bus))
+        self.devices[(bus, addr)] = device
+        return device
+
+    def start(self):
+        """Start one BusWorker per bus; does nothing for a group without devices."""
+        if not self.devices:
+            return
+        for key, device in self.devices.items():
+            self.rings[key] = PacketRing(self.capacity, device.dmpGetFIFOPacketSize())
+
+        by_bus = {}
+        for key, device in self.devices.items():
+            by_bus.setdefault(key[0], {})[key] = device
+
+        # drain well before the 1024-byte FIFO can overflow
+        batch = max(1, min(self.batch, MPU6050.MPU6050_FIFO_SIZE // max(d.dmpGetFIFOPacketSize() for d in self.devices.values()) // 2))
+        self._workers = [BusWorker(bus, devices, self.rings, batch) for bus, devices in by_bus.items()]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self):
+        for worker in self._workers:
+            worker.stop()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def close(self):
+        self.stop()
+        self.pool.close()
+
+    def latest(self):
+        """Newest (seq, timestamp, packet) of every device, None for devices without data yet."""
+        return {key: ring.latest() for key, ring in self.rings.items()}
+
+    def aligned(self, tolerance=None):
+        """Return one sample per device closest to a common instant.
+
+        The instant is the oldest of the devices' newest timestamps, so every
+        device has data at it. Returns {key: (seq, timestamp, packet)}, or None
+        if a device has no data or its nearest sample is more than tolerance
+        seconds away.
+        """
+        newest = self.latest()
+        if not newest or None in newest.values():
+            return None
+        instant = min(item[1] for item in newest.values())
+
+        samples = {}
+        for key, ring in self.rings.items():
+            best = ring.nearest(instant)
+            if best is None: # overwritten while searching
+                return None
+            if tolerance is not None and abs(best[1] - instant) > tolerance:
+                return None
+            samples[key] = best
+        return samples
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+import os
+import struct
+import time
+
+MAGIC = b'MPU6050R'
+VERSION = 1
+
+# magic, version, header size, packet size, record size, tick (s), rate (Hz),
+# accel range, gyro range, 6 offsets (as GetActiveOffsets), start wall time
+_header = struct.Struct('<8sHHHHddBB6hd')
+HEADER_SIZE = 64
+_timestamp = struct.Struct('<q')
+
+
+class PacketRecorder:
+    """Appends raw FIFO packets to a fixed-record binary file.
+
+    Each record is a little-endian int64 timestamp, counted in `tick` seconds
+    since the recorder was opened (negative for packets timestamped before
+    that), followed by the packet bytes. Records are
+    collected in a preallocated buffer and written `chunk_records` at a time.
+    """
+    def __init__(self, path, packet_size = 42, rate = 0.0, accel_range = 0, gyro_range = 0, offsets = (0,) * 6, tick = 1e-4, chunk_records = 4096):
+        self.packet_size = packet_size
+        self.record_size = _timestamp.size + packet_size
+        self.tick = tick
+        self._buffer = bytearray(self.record_size * chunk_records)
+        self._pos = 0
+        self._start = time.monotonic()
+
+        self._file = open(path, 'wb')
+        header = _header.pack(MAGIC, VERSION, HEADER_SIZE, packet_size, self.record_size, tick, rate,
+                              accel_range, gyro_range, *offsets, time.time())
+        self._file.write(header.ljust(HEADER_SIZE, b'\0'))
+
+    @classmethod
+    def from_device(cls, path, device, **kwargs):
+        """Recorder whose header describes device's current packet size, rate, ranges and offsets."""
+        return cls(path, device.dmpGetFIFOPacketSize(), device.dmpGetFIFORate(), device.getFullScaleAccelRange(),
+                   device.getFullScaleGyroRange(), device.GetActiveOffsets(), **kwargs)
+
+    def append(self, packet, timestamp = None):
+        """Add one packet; timestamp is a time.monotonic() value, now if None."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        pos = self._pos
+        _timestamp.pack_into(self._buffer, pos, round((timestamp - self._start) / self.tick))
+        self._buffer[pos + _timestamp.size:pos + self.record_size] = packet
+        self._pos = pos + self.record_size
+        if self._pos == len(self._buffer):
+            self.flush()
+
+    def extend(self, packets, timestamp = None):
+        for packet in packets:
+            self.append(packet, timestamp)
+
+    def flush(self):
+        if self._pos:
+            self._file.write(memoryview(self._buffer)[:self._pos])
+            self._pos = 0
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        data = f.read(HEADER_SIZE)
+    fields = _header.unpack_from(data)
+    if fields[0] != MAGIC:
+        raise ValueError(f"{path} is not an MPU6050 recording")
+    return {
+        'version': fields[1],
+        'header_size': fields[2],
+        'packet_size': fields[3],
+        'record_size': fields[4],
+        'tick': fields[5],
+        'rate': fields[6],
+        'accel_range': fields[7],
+        'gyro_range': fields[8],
+        'offsets': list(fields[9:15]),
+        'start_time': fields[15],
+    }
+
+
+def open_recording(path):
+    """Memory-map a recording; returns (header, records).
+
+    records is a read-only NumPy structured array with fields 'time' (int64
+    ticks) and 'packet' (uint8 per packet byte), backed by the file without
+    copying. A partly written last record is ignored.
+    """
+    import numpy as np # only the reader needs NumPy
+
+    header = read_header(path)
+    dtype = np.dtype([('time', '<i8'), ('packet', 'u1', (header['packet_size'],))])
+    count = (os.path.getsize(path) - header['header_size']) // dtype.itemsize
+    if count == 0:
+        return header, np.empty(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode='r', offset=header['header_size'], shape=(count,))
@@ -0,0 +1,234 @@
+"""End-to-end driver benchmark against the simulated bus in smbus_mock.
+
+    python benchmark.py --latency 0.0002 --duration 2 --json result.json
+    python benchmark.py --baseline result.json   # exits 1 on regressions
+
+Every scenario runs the real driver code on a fresh simulated MPU6050 whose
+bus transactions each take `latency` seconds.
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+
+import smbus_mock
+from MPU6050_6Axis_MotionApps20 import MPU6050
+
+try:
+    from MPU6050_calibration_stats import calibrate_statistical
+except ImportError: # NumPy is optional
+    calibrate_statistical = None
+
+# Metrics where a larger value is a regression; everything else is informational
+LOWER_IS_BETTER = (
+    'seconds', 'transactions', 'transactions_per_sample', 'bytes_per_sample', 'cpu_us_per_sample',
+    'loss_rate', 'latency_ms_p50', 'latency_ms_p90', 'latency_ms_p99',
+)
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress prints swallowed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def new_device(latency, noise=2.0):
+    bus = smbus_mock.SMBus(0, noise=noise, accel_bias=(0.02, -0.01, 0.03), gyro_bias=(0.5, -0.3, 0.2), seed=1)
+    device = MPU6050(0x68, smbus=bus)
+    bus.latency = latency
+    return bus, device
+
+
+def ready_device(latency, packet_mode=None):
+    """Device with the DMP initialised and running; setup is done without bus latency."""
+    bus, device = new_device(0.0)
+    quiet(device.dmpInitialize, packet_mode=packet_mode)
+    device.setDMPEnabled(True)
+    device.resetFIFO()
+    bus.latency = latency
+    bus.reset_counters()
+    return bus, device
+
+
+def measure(bus, func):
+    bus.reset_counters()
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = func()
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def acquisition_report(bus, device, delivered, latencies, wall, cpu, emitted=None):
+    report = {
+        'samples': delivered,
+        'seconds': wall,
+        'transactions_per_sample': bus.transactions / delivered if delivered else None,
+        'bytes_per_sample': (bus.bytes_read + bus.bytes_written) / delivered if delivered else None,
+        'cpu_us_per_sample': cpu / delivered * 1e6 if delivered else None,
+        'loss_rate': None,
+        'latency_ms_p50': percentile(latencies, 0.5),
+        'latency_ms_p90': percentile(latencies, 0.9),
+        'latency_ms_p99': percentile(latencies, 0.99),
+    }
+    if emitted:
+        left = len(bus.device(0x68).fifo) // device.dmpGetFIFOPacketSize()
+        report['loss_rate'] = max(0, emitted - delivered - left) / emitted
+    return report
+
+
+def bench_startup(args):
+    bus, device = new_device(args.latency)
+    status, cold, _ = measure(bus, lambda: quiet(device.dmpInitialize))
+    cold_transactions = bus.transactions
+
+    warm_device = MPU6050(0x68, smbus=bus)
+    _, warm, _ = measure(bus, lambda: quiet(warm_device.dmpInitialize))
+    return {
+        'status': status,
+        'seconds': cold,
+        'transactions': cold_transactions,
+        'warm_seconds': warm,
+        'warm_transactions': bus.transactions,
+    }
+
+
+def bench_calibration(args):
+    bus, device = ready_device(args.latency)
+    _, seconds, _ = measure(bus, lambda: quiet(lambda: (device.CalibrateAccel(6), device.CalibrateGyro(6))))
+    report = {'seconds': seconds, 'transactions': bus.transactions, 'offsets': device.GetActiveOffsets()}
+
+    if calibrate_statistical is not None:
+        bus, device = ready_device(args.latency)
+        _, seconds, _ = measure(bus, lambda: calibrate_statistical(device))
+        report['statistical_seconds'] = seconds
+        report['statistical_transactions'] = bus.transactions
+        report['statistical_offsets'] = device.GetActiveOffsets()
+    return report
+
+
+def run_packets(args, bus, device, next_packets):
+    """Drive next_packets() for args.duration seconds and collect delivery statistics."""
+    simulator = bus.device(0x68)
+    latencies = []
+    delivered = 0
+    emitted_before = simulator.samples
+
+    def loop():
+        nonlocal delivered
+        end = time.monotonic() + args.duration
+        while time.monotonic() < end:
+            for packet in next_packets():
+                now = simulator.clock()
+                latencies.append((now - simulator.packet_time(packet)) * 1000)
+                delivered += 1
+
+    _, wall, cpu = measure(bus, loop)
+    simulator.update()
+    return acquisition_report(bus, device, delivered, latencies, wall, cpu, simulator.samples - emitted_before)
+
+
+def bench_polling(args):
+    """The classic loop around dmpGetCurrentFIFOPacket, which returns 0 when nothing is ready."""
+    bus, device = ready_device(args.latency, args.packet_mode)
+    def next_packets():
+        packet = device.dmpGetCurrentFIFOPacket()
+        return [bytes(packet)] if packet else []
+    return run_packets(args, bus, device, next_packets)
+
+
+def bench_drain(args):
+    """Batched drainFIFO calls with sleeps in between, as packets() does.
+
+    Driven directly rather than through the generator so that a scenario never
+    ends with drained packets still buffered inside it, which would count as lost.
+    """
+    bus, device = ready_device(args.latency, args.packet_mode)
+    interval = args.batch / device.dmpGetFIFORate()
+    def next_packets():
+        time.sleep(interval)
+        return [bytes(packet) for packet in device.drainFIFO()]
+    return run_packets(args, bus, device, next_packets)
+
+
+def bench_motion6(args):
+    bus, device = ready_device(args.latency)
+    latencies = []
+
+    def loop():
+        for _ in range(args.samples):
+            start = time.perf_counter()
+            device.getMotion6()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    _, wall, cpu = measure(bus, loop)
+    return acquisition_report(bus, device, args.samples, latencies, wall, cpu)
+
+
+SCENARIOS = {
+    'startup': bench_startup,
+    'calibration': bench_calibration,
+    'polling': bench_polling,
+    'drain': bench_drain,
+    'motion6': bench_motion6,
+}
+
+
+def compare(results, baseline, tolerance):
+    """Return (scenario, metric, baseline, current) for metrics that got worse by more than tolerance."""
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(scenario, {}).get(metric)
+            if metric not in LOWER_IS_BETTER or value is None or base is None:
+                continue
+            if value > base * (1 + tolerance) and value - base > 1e-9:
+                regressions.append((scenario, metric, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.0002, help='seconds per bus transaction')
+    parser.add_argument('--duration', type=float, default=2.0, help='seconds per FIFO acquisition scenario')
+    parser.add_argument('--samples', type=int, default=500, help='getMotion6 calls')
+    parser.add_argument('--batch', type=int, default=4, help='packets per drain in the drain scenario')
+    parser.add_argument('--packet-mode', choices=MPU6050.DMP_PACKET_LAYOUTS, help='DMP packet layout for polling and drain')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='compare with results from an earlier --json run')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='allowed relative regression')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.scenarios:
+        results[name] = SCENARIOS[name](args)
+        print(f"{name}:")
+        for metric, value in results[name].items():
+            print(f"  {metric}: {value:.4g}" if isinstance(value, float) else f"  {metric}: {value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for scenario, metric, base, value in regressions:
+            print(f"REGRESSION {scenario}.{metric}: {base:.4g} -> {value:.4g}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
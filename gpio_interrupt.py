@@ -0,0 +1,82 @@
+import fcntl
+import os
+import select
+import struct
+
+# Linux GPIO character device ABI (v1 line events, include/uapi/linux/gpio.h)
+GPIOHANDLE_REQUEST_INPUT = 1 << 0
+GPIOEVENT_REQUEST_RISING_EDGE = 1 << 0
+GPIOEVENT_REQUEST_FALLING_EDGE = 1 << 1
+GPIOEVENT_REQUEST_BOTH_EDGES = GPIOEVENT_REQUEST_RISING_EDGE | GPIOEVENT_REQUEST_FALLING_EDGE
+
+_gpioevent_request = struct.Struct('III32si') # lineoffset, handleflags, eventflags, consumer_label, fd
+_GPIOEVENT_DATA_SIZE = 16 # u64 timestamp, u32 id, padding
+GPIO_GET_LINEEVENT_IOCTL = (3 << 30) | (_gpioevent_request.size << 16) | (0xB4 << 8) | 0x04
+
+
+class InterruptSource:
+    """Wakeup source backed by a readable file descriptor.
+
+    Any readable fd works (pipe, eventfd, socket); each wait() drains whatever
+    is pending so several edges between two waits count as one wakeup.
+    """
+    def __init__(self, fd):
+        self.fd = fd
+        os.set_blocking(fd, False)
+
+    def fileno(self):
+        return self.fd
+
+    def wait(self, timeout=None):
+        """Block until the source fires or timeout seconds pass. Returns True if it fired."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, _GPIOEVENT_DATA_SIZE * 64):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GPIOInterrupt(InterruptSource):
+    """Edge events on a GPIO line through /dev/gpiochipN, e.g. the MPU6050 INT pin."""
+    def __init__(self, chip, line, edge=GPIOEVENT_REQUEST_RISING_EDGE, consumer='mpu6050'):
+        path = chip if isinstance(chip, str) else f'/dev/gpiochip{chip}'
+        request = bytearray(_gpioevent_request.pack(line, GPIOHANDLE_REQUEST_INPUT, edge, consumer.encode()[:31], 0))
+
+        chip_fd = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.ioctl(chip_fd, GPIO_GET_LINEEVENT_IOCTL, request)
+        finally:
+            os.close(chip_fd)
+
+        super().__init__(_gpioevent_request.unpack(request)[4])
+
+
+class PipeInterrupt(InterruptSource):
+    """Test stand-in: fires whenever trigger() is called."""
+    def __init__(self):
+        read_fd, self.write_fd = os.pipe()
+        super().__init__(read_fd)
+
+    def trigger(self):
+        os.write(self.write_fd, b'\x01')
+
+    def close(self):
+        super().close()
+        if self.write_fd is not None:
+            os.close(self.write_fd)
+            self.write_fd = None
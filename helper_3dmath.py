@@ -1,28 +1,90 @@
 import math
+import struct
+
+# The DMP stores each component as a 32-bit big-endian word; the upper 16 bits are enough
+WORDS3 = struct.Struct('>h2xh2xh')
+WORDS4 = struct.Struct('>h2xh2xh2xh')
 
 class Quaternion:
+    # No instance dict: smaller, faster attribute access, and the in-place
+    # methods below let a per-sample loop reuse the same objects
+    __slots__ = ('w', 'x', 'y', 'z')
+
     def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
         self.w = w
         self.x = x
         self.y = y
         self.z = z
 
-    def get_product(self, q):
-        """Multiply this quaternion with another quaternion."""
-        return Quaternion(
-            self.w * q.w - self.x * q.x - self.y * q.y - self.z * q.z,  # new w
-            self.w * q.x + self.x * q.w + self.y * q.z - self.z * q.y,  # new x
-            self.w * q.y - self.x * q.z + self.y * q.w + self.z * q.x,  # new y
-            self.w * q.z + self.x * q.y - self.y * q.x + self.z * q.w   # new z
-        )
+    @classmethod
+    def from_buffer(cls, buffer, offset=0, scale=1 / 16384.0, out=None):
+        """Decode a DMP quaternion (four 32-bit words, upper 16 bits used) at offset in buffer.
 
-    def get_conjugate(self):
-        """Return the conjugate of the quaternion."""
-        return Quaternion(self.w, -self.x, -self.y, -self.z)
+        buffer may also be a list of byte values as returned by getFIFOBytes. The
+        result is written into out when given, otherwise a new quaternion is returned.
+        """
+        w, x, y, z = WORDS4.unpack_from(bytes(buffer) if isinstance(buffer, list) else buffer, offset)
+        if out is None:
+            return cls(w * scale, x * scale, y * scale, z * scale)
+        return out.set(w * scale, x * scale, y * scale, z * scale)
+
+    def set(self, w, x, y, z):
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def into(self, out):
+        """Copy this quaternion into out and return it."""
+        out.w = self.w
+        out.x = self.x
+        out.y = self.y
+        out.z = self.z
+        return out
+
+    def get_product(self, q, out=None):
+        """Multiply this quaternion with another quaternion, into out if given."""
+        if out is None:
+            out = Quaternion()
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = q.w, q.x, q.y, q.z
+        out.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2  # new w
+        out.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2  # new x
+        out.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2  # new y
+        out.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2  # new z
+        return out
+
+    def multiply(self, q):
+        """self = self * q, in place."""
+        return self.get_product(q, self)
+
+    def multiply_conjugate(self, q):
+        """self = self * conj(q), in place; the rotation from q to self for unit quaternions."""
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = q.w, -q.x, -q.y, -q.z
+        self.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        self.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        self.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        self.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        return self
+
+    def conjugate(self):
+        """Conjugate the quaternion in place."""
+        self.x = -self.x
+        self.y = -self.y
+        self.z = -self.z
+        return self
+
+    def get_conjugate(self, out=None):
+        """Return the conjugate of the quaternion, into out if given."""
+        if out is None:
+            return Quaternion(self.w, -self.x, -self.y, -self.z)
+        return out.set(self.w, -self.x, -self.y, -self.z)
 
     def get_magnitude(self):
         """Calculate the magnitude of the quaternion."""
-        return math.sqrt(self.w ** 2 + self.x ** 2 + self.y ** 2 + self.z ** 2)
+        return math.sqrt(self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z)
 
     def normalize(self):
         """Normalize the quaternion in place."""
@@ -32,27 +94,53 @@ class Quaternion:
             self.x /= m
             self.y /= m
             self.z /= m
+        return self
+
+    def get_normalized(self, out=None):
+        """Return a normalized copy of the quaternion, into out if given."""
+        return self.into(out if out is not None else Quaternion()).normalize()
 
-    def get_normalized(self):
-        """Return a new normalized quaternion."""
-        r = Quaternion(self.w, self.x, self.y, self.z)
-        r.normalize()
-        return r
-    
     def __str__(self):
         """Return a string representation of the quaternion with fixed precision."""
         return f"({self.w:.2f}, {self.x:.2f}, {self.y:.2f}, {self.z:.2f})"
 
 
 class Vector3:
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, nx=0, ny=0, nz=0):
         self.x = nx
         self.y = ny
         self.z = nz
 
+    @classmethod
+    def from_buffer(cls, buffer, offset=0, scale=1, out=None):
+        """Decode three DMP words (upper 16 bits used) at offset in buffer, e.g. gyro at 16 or accel at 28.
+
+        buffer may also be a list of byte values. The result is written into out when
+        given, otherwise a new vector is returned.
+        """
+        x, y, z = WORDS3.unpack_from(bytes(buffer) if isinstance(buffer, list) else buffer, offset)
+        if out is None:
+            return cls(x * scale, y * scale, z * scale)
+        return out.set(x * scale, y * scale, z * scale)
+
+    def set(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def into(self, out):
+        """Copy this vector into out and return it."""
+        out.x = self.x
+        out.y = self.y
+        out.z = self.z
+        return out
+
     def get_magnitude(self):
         """Calculate the magnitude of the vector."""
-        return math.sqrt(self.x ** 2 + self.y ** 2 + self.z ** 2)
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def normalize(self):
         """Normalize the vector in place."""
@@ -61,31 +149,31 @@ class Vector3:
             self.x /= m
             self.y /= m
             self.z /= m
+        return self
 
-    def get_normalized(self):
-        """Return a new normalized vector."""
-        r = Vector3(self.x, self.y, self.z)
-        r.normalize()
-        return r
+    def get_normalized(self, out=None):
+        """Return a normalized copy of the vector, into out if given."""
+        return self.into(out if out is not None else Vector3()).normalize()
 
     def rotate(self, q):
-        """Rotate the vector by a quaternion."""
-        # Create a quaternion representation of the vector
-        p = Quaternion(0, self.x, self.y, self.z)
-
-        # Quaternion multiplication: q * p
-        p = q.get_product(p)
-
-        # Quaternion multiplication: p * conj(q)
-        p = p.get_product(q.get_conjugate())
-
-        # Update the vector components with the rotated quaternion parts
-        self.x = p.x
-        self.y = p.y
-        self.z = p.z
-
-    def get_rotated(self, q):
-        """Return a new vector that is the result of rotating this vector by a quaternion."""
-        r = Vector3(self.x, self.y, self.z)
-        r.rotate(q)
-        return r
\ No newline at end of file
+        """Rotate the vector by a quaternion, in place.
+
+        Expanded form of q * (0, v) * conj(q), so no intermediate quaternions
+        are built: v' = (w^2 - u.u) v + 2 (u.v) u + 2 w (u x v) with u = (q.x, q.y, q.z).
+        """
+        w, ux, uy, uz = q.w, q.x, q.y, q.z
+        vx, vy, vz = self.x, self.y, self.z
+        s = w * w - (ux * ux + uy * uy + uz * uz)
+        d = 2 * (ux * vx + uy * vy + uz * vz)
+        w2 = 2 * w
+        self.x = s * vx + d * ux + w2 * (uy * vz - uz * vy)
+        self.y = s * vy + d * uy + w2 * (uz * vx - ux * vz)
+        self.z = s * vz + d * uz + w2 * (ux * vy - uy * vx)
+        return self
+
+    def get_rotated(self, q, out=None):
+        """Return this vector rotated by a quaternion, into out if given."""
+        return self.into(out if out is not None else Vector3()).rotate(q)
+
+    def __str__(self):
+        return f"({self.x:.2f}, {self.y:.2f}, {self.z:.2f})"
@@ -0,0 +1,267 @@
+import numpy as np
+
+from helper_3dmath import Quaternion, Vector3
+from helper_dmp_batch import PACKET_DTYPE, decode_quaternions, decode_packets
+
+# Array counterparts of helper_3dmath for post-processing many samples at once.
+# Components are stored as float64 (N,4) w, x, y, z and (N,3) x, y, z arrays;
+# every operation is vectorised over N and broadcasts against a single
+# Quaternion/Vector3 or an array of length 1.
+
+
+def _quaternion_data(q):
+    if isinstance(q, QuaternionArray):
+        return q.data
+    if isinstance(q, Quaternion):
+        return np.array([[q.w, q.x, q.y, q.z]])
+    return np.asarray(q, dtype=float).reshape(-1, 4)
+
+
+def _vector_data(v):
+    if isinstance(v, Vector3Array):
+        return v.data
+    if isinstance(v, Vector3):
+        return np.array([[v.x, v.y, v.z]])
+    return np.asarray(v, dtype=float).reshape(-1, 3)
+
+
+def _product(a, b):
+    w1, x1, y1, z1 = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    w2, x2, y2, z2 = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    return np.stack((
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+    ), axis=1)
+
+
+class QuaternionArray:
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        """Wrap an (N,4) array-like of w, x, y, z (no copy if it already is a float array)."""
+        self.data = _quaternion_data(data)
+
+    @classmethod
+    def from_packets(cls, data, dtype=PACKET_DTYPE):
+        """Decode the quaternions of many DMP packets, see helper_dmp_batch.packets_view."""
+        return cls(decode_quaternions(data, dtype))
+
+    @classmethod
+    def from_quaternions(cls, quaternions):
+        return cls(np.array([(q.w, q.x, q.y, q.z) for q in quaternions], dtype=float).reshape(-1, 4))
+
+    @classmethod
+    def identity(cls, n):
+        data = np.zeros((n, 4))
+        data[:, 0] = 1.0
+        return cls(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """A Quaternion for an integer index, a QuaternionArray for slices and masks."""
+        if isinstance(index, (int, np.integer)):
+            return Quaternion(*(float(c) for c in self.data[index]))
+        return QuaternionArray(self.data[index])
+
+    def __iter__(self):
+        for w, x, y, z in self.data.tolist():
+            yield Quaternion(w, x, y, z)
+
+    def to_list(self):
+        return list(self)
+
+    @property
+    def w(self):
+        return self.data[:, 0]
+
+    @property
+    def x(self):
+        return self.data[:, 1]
+
+    @property
+    def y(self):
+        return self.data[:, 2]
+
+    @property
+    def z(self):
+        return self.data[:, 3]
+
+    def get_product(self, q):
+        """Element-wise self * q; q may be a QuaternionArray, a Quaternion or an (N,4) array."""
+        return QuaternionArray(_product(self.data, _quaternion_data(q)))
+
+    def get_conjugate(self):
+        return QuaternionArray(self.data * (1.0, -1.0, -1.0, -1.0))
+
+    def get_magnitude(self):
+        """(N,) array of magnitudes."""
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def normalize(self):
+        """Normalize every quaternion in place; zero quaternions are left alone."""
+        m = self.get_magnitude()
+        m[m == 0] = 1.0
+        self.data /= m[:, None]
+        return self
+
+    def get_normalized(self):
+        return QuaternionArray(self.data.copy()).normalize()
+
+    def rotate(self, v):
+        """Rotate vectors by these quaternions, as Vector3.rotate; returns a Vector3Array."""
+        v = _vector_data(v)
+        w = self.data[:, 0:1]
+        u = self.data[:, 1:4]
+        s = w * w - np.sum(u * u, axis=1, keepdims=True)
+        d = 2 * np.sum(u * v, axis=1, keepdims=True)
+        return Vector3Array(s * v + d * u + 2 * w * np.cross(u, v))
+
+    def slerp(self, q, t):
+        """Spherical interpolation from self (t = 0) to q (t = 1); t is a scalar or (N,) array."""
+        a = self.data
+        b = np.array(np.broadcast_to(_quaternion_data(q), a.shape))
+        t = np.asarray(t, dtype=float).reshape(-1, 1)
+        dot = np.einsum('ij,ij->i', a, b)
+        # q and -q are the same rotation; take the short way round
+        b[dot < 0] *= -1
+        dot = np.abs(dot)[:, None]
+
+        theta = np.arccos(np.clip(dot, -1.0, 1.0))
+        sin_theta = np.sin(theta)
+        close = sin_theta < 1e-6 # nearly identical: fall back to linear interpolation
+        safe = np.where(close, 1.0, sin_theta)
+        wa = np.where(close, 1 - t, np.sin((1 - t) * theta) / safe)
+        wb = np.where(close, t, np.sin(t * theta) / safe)
+        return QuaternionArray(wa * a + wb * b).normalize()
+
+    def get_gravity(self):
+        """Gravity direction in the sensor frame for every quaternion, as the MotionApps dmpGetGravity."""
+        w, x, y, z = self.data.T
+        return Vector3Array(np.stack((
+            2 * (x * z - w * y),
+            2 * (w * x + y * z),
+            w * w - x * x - y * y + z * z,
+        ), axis=1))
+
+    def get_euler(self):
+        """(N,3) psi, theta, phi in radians, as the MotionApps dmpGetEuler."""
+        w, x, y, z = self.data.T
+        return np.stack((
+            np.arctan2(2 * x * y - 2 * w * z, 2 * w * w + 2 * x * x - 1),
+            -np.arcsin(np.clip(2 * x * z + 2 * w * y, -1.0, 1.0)),
+            np.arctan2(2 * y * z - 2 * w * x, 2 * w * w + 2 * z * z - 1),
+        ), axis=1)
+
+    def get_yaw_pitch_roll(self):
+        """(N,3) yaw, pitch, roll in radians, as the MotionApps dmpGetYawPitchRoll."""
+        w, x, y, z = self.data.T
+        gravity = self.get_gravity().data
+        gx, gy, gz = gravity.T
+        yaw = np.arctan2(2 * x * y - 2 * w * z, 2 * w * w + 2 * x * x - 1)
+        pitch = np.arctan2(gx, np.sqrt(gy * gy + gz * gz))
+        roll = np.arctan2(gy, gz)
+        # upside down: continue pitch past +-90 degrees
+        pitch = np.where(gz < 0, np.where(pitch > 0, np.pi - pitch, -np.pi - pitch), pitch)
+        return np.stack((yaw, pitch, roll), axis=1)
+
+    def get_rotation_matrix(self):
+        """(N,3,3) rotation matrices of the (unit) quaternions."""
+        w, x, y, z = self.data.T
+        m = np.empty((len(self.data), 3, 3))
+        m[:, 0, 0] = 1 - 2 * (y * y + z * z)
+        m[:, 0, 1] = 2 * (x * y - w * z)
+        m[:, 0, 2] = 2 * (x * z + w * y)
+        m[:, 1, 0] = 2 * (x * y + w * z)
+        m[:, 1, 1] = 1 - 2 * (x * x + z * z)
+        m[:, 1, 2] = 2 * (y * z - w * x)
+        m[:, 2, 0] = 2 * (x * z - w * y)
+        m[:, 2, 1] = 2 * (y * z + w * x)
+        m[:, 2, 2] = 1 - 2 * (x * x + y * y)
+        return m
+
+
+class Vector3Array:
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        """Wrap an (N,3) array-like of x, y, z (no copy if it already is a float array)."""
+        self.data = _vector_data(data)
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        return cls(np.array([(v.x, v.y, v.z) for v in vectors], dtype=float).reshape(-1, 3))
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """A Vector3 for an integer index, a Vector3Array for slices and masks."""
+        if isinstance(index, (int, np.integer)):
+            return Vector3(*(float(c) for c in self.data[index]))
+        return Vector3Array(self.data[index])
+
+    def __iter__(self):
+        for x, y, z in self.data.tolist():
+            yield Vector3(x, y, z)
+
+    def to_list(self):
+        return list(self)
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def z(self):
+        return self.data[:, 2]
+
+    def get_magnitude(self):
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def normalize(self):
+        """Normalize every vector in place; zero vectors are left alone."""
+        m = self.get_magnitude()
+        m[m == 0] = 1.0
+        self.data /= m[:, None]
+        return self
+
+    def get_normalized(self):
+        return Vector3Array(self.data.copy()).normalize()
+
+    def get_rotated(self, q):
+        """Rotate every vector by the matching quaternion (or one Quaternion for all)."""
+        if not isinstance(q, QuaternionArray):
+            q = QuaternionArray(q)
+        return q.rotate(self.data)
+
+
+def derived_from_packets(data, dtype=PACKET_DTYPE, accel_lsb=8192, world=True):
+    """Batch counterpart of MPU6050.dmpGetDerived for many DMP packets at once.
+
+    Returns a dict of arrays: 'quaternion' (N,4), 'gravity' (N,3), 'ypr' (N,3),
+    'linear_accel' (N,3) and, unless world is False, 'linear_accel_world' (N,3).
+    Accelerations are in DMP accel units (accel_lsb per g) and left out when the
+    packet layout in dtype (see helper_dmp_batch.PACKET_DTYPES) has no accel.
+    """
+    quat, _, accel = decode_packets(data, dtype)
+    q = QuaternionArray(quat)
+    gravity = q.get_gravity().data
+    result = {
+        'quaternion': quat,
+        'gravity': gravity,
+        'ypr': q.get_yaw_pitch_roll(),
+    }
+    if accel is not None:
+        linear = accel - gravity * accel_lsb
+        result['linear_accel'] = linear
+        if world:
+            result['linear_accel_world'] = q.rotate(linear).data
+    return result
@@ -0,0 +1,73 @@
+import numpy as np
+
+# Default MotionApps v2.0 42-byte FIFO packet (see MPU6050_6Axis_MotionApps20.MPU6050).
+# Every field is a 32-bit big-endian word; quaternion components are Q30 fixed
+# point, gyro and accel carry the sensor value in the upper 16 bits.
+PACKET_DTYPE = np.dtype({
+    'names':    ['quat', 'gyro', 'accel'],
+    'formats':  [('>i4', (4,)), ('>i4', (3,)), ('>i4', (3,))],
+    'offsets':  [0, 16, 28],
+    'itemsize': 42,
+})
+
+# Compact layouts selected with MPU6050.dmpSetPacketMode, keyed by packet mode
+PACKET_DTYPES = {
+    'quat_gyro_accel': PACKET_DTYPE,
+    'quat_accel': np.dtype({
+        'names':    ['quat', 'accel'],
+        'formats':  [('>i4', (4,)), ('>i4', (3,))],
+        'offsets':  [0, 16],
+        'itemsize': 30,
+    }),
+    'quat': np.dtype({
+        'names':    ['quat'],
+        'formats':  [('>i4', (4,))],
+        'offsets':  [0],
+        'itemsize': 18,
+    }),
+}
+
+QUATERNION_SCALE = 1.0 / (1 << 30)
+
+
+def packets_view(data, dtype=PACKET_DTYPE):
+    """Return a zero-copy structured array over the whole packets in data.
+
+    data is bytes, bytearray or memoryview, or an (N, packet size) uint8 array
+    such as the 'packet' field of MPU6050_recording.open_recording.
+    """
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        return data.view(dtype)[:, 0]
+    return np.frombuffer(data, dtype=dtype, count=len(data) // dtype.itemsize)
+
+
+def decode_quaternions(data, dtype=PACKET_DTYPE):
+    """Return an (N,4) float array of w, x, y, z quaternions."""
+    return packets_view(data, dtype)['quat'] * QUATERNION_SCALE
+
+
+def decode_quaternions_raw(data, dtype=PACKET_DTYPE):
+    """Return an (N,4) int16 array of raw quaternion components, as dmpGetQuaternionRaw."""
+    return (packets_view(data, dtype)['quat'] >> 16).astype(np.int16)
+
+
+def decode_gyro(data, dtype=PACKET_DTYPE):
+    """Return an (N,3) int16 array of raw gyro readings."""
+    return (packets_view(data, dtype)['gyro'] >> 16).astype(np.int16)
+
+
+def decode_accel(data, dtype=PACKET_DTYPE):
+    """Return an (N,3) int16 array of raw accel readings."""
+    return (packets_view(data, dtype)['accel'] >> 16).astype(np.int16)
+
+
+def decode_packets(data, dtype=PACKET_DTYPE):
+    """Decode N packets at once into (quaternion (N,4), gyro (N,3), accel (N,3)) arrays.
+
+    gyro and accel are None when the layout in dtype does not carry them.
+    """
+    view = packets_view(data, dtype)
+    quat = view['quat'] * QUATERNION_SCALE
+    gyro = (view['gyro'] >> 16).astype(np.int16) if 'gyro' in dtype.names else None
+    accel = (view['accel'] >> 16).astype(np.int16) if 'accel' in dtype.names else None
+    return quat, gyro, accel
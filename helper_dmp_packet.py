@@ -0,0 +1,78 @@
+import struct
+
+from helper_3dmath import Quaternion, Vector3, WORDS3, WORDS4
+
+# Every field of the MotionApps v2.0 packet is a 32-bit big-endian word; the
+# 16-bit values used by the decoders are the upper halves (WORDS3/WORDS4)
+_Q30 = struct.Struct('>4i')
+
+
+class DMPPacket:
+    """View of one DMP FIFO packet that decodes fields only when they are asked for.
+
+    Wraps a memoryview (normally a slice of the driver's shared receive buffer,
+    see MPU6050.dmpGetPackets), so creating one copies nothing. The data behind
+    it is overwritten by the next read into that buffer: call copy() to keep a
+    packet past it. Indexing and len() behave like the bytes of the packet, so
+    a DMPPacket can also be passed to the dmpGet* decoders of the driver.
+
+    gyro_offset and accel_offset follow the driver's packet mode (see
+    MPU6050.DMP_PACKET_LAYOUTS); None means the packet does not carry it.
+    """
+    __slots__ = ('buffer', 'gyro_offset', 'accel_offset')
+
+    QUATERNION_SCALE = 1 / 16384.0
+
+    def __init__(self, buffer, gyro_offset=16, accel_offset=28):
+        self.buffer = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self.gyro_offset = gyro_offset
+        self.accel_offset = accel_offset
+
+    def copy(self):
+        """A DMPPacket over a private copy of the data."""
+        return DMPPacket(bytes(self.buffer), self.gyro_offset, self.accel_offset)
+
+    def _offset(self, field):
+        offset = self.gyro_offset if field == 'gyro' else self.accel_offset
+        if offset is None:
+            raise ValueError(f"This DMP packet carries no {field}")
+        return offset
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def __getitem__(self, index):
+        return self.buffer[index]
+
+    def __bytes__(self):
+        return bytes(self.buffer)
+
+    @property
+    def quaternion_raw(self):
+        """(w, x, y, z) as 16-bit integers, as dmpGetQuaternionRaw."""
+        return WORDS4.unpack_from(self.buffer)
+
+    @property
+    def quaternion_q30(self):
+        """(w, x, y, z) at full Q30 precision."""
+        return _Q30.unpack_from(self.buffer)
+
+    @property
+    def gyro(self):
+        """Raw (x, y, z) gyro, as dmpGetGyro."""
+        return WORDS3.unpack_from(self.buffer, self._offset('gyro'))
+
+    @property
+    def accel(self):
+        """Raw (x, y, z) accel, as dmpGetAccel."""
+        return WORDS3.unpack_from(self.buffer, self._offset('accel'))
+
+    def quaternion(self, out=None):
+        """The quaternion as dmpGetQuaternion, written into out when given."""
+        return Quaternion.from_buffer(self.buffer, 0, self.QUATERNION_SCALE, out)
+
+    def gyro_vector(self, scale=1, out=None):
+        return Vector3.from_buffer(self.buffer, self._offset('gyro'), scale, out)
+
+    def accel_vector(self, scale=1, out=None):
+        return Vector3.from_buffer(self.buffer, self._offset('accel'), scale, out)